@@ -0,0 +1,246 @@
+# Reproducible TodoMaster benchmarks.
+#
+#   python benchmarks/bench.py                                  # core benchmarks at 1k/10k/100k tasks
+#   python benchmarks/bench.py --gui                            # also time the GUI (starts Xvfb if needed)
+#   python benchmarks/bench.py --output new.json --compare old.json
+#
+# Results are written as JSON keyed by "<suite>/<operation>/<size>". With --compare, any
+# operation whose median got slower than --threshold exits with status 1.
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import todo_core
+from todo_core import CATEGORIES, PRIORITY_ORDER, open_store, set_completed
+
+WORDS = ["buy", "milk", "call", "mom", "write", "report", "gym", "review", "pull", "request",
+         "book", "flight", "pay", "rent", "fix", "bike", "read", "chapter", "plan", "sprint"]
+
+def generate_tasks(count, seed=1234):
+    rng = random.Random(seed)
+    today = date(2025, 1, 1)
+    tasks = []
+    for i in range(count):
+        completed = rng.random() < 0.3
+        due_date = today + timedelta(days=rng.randint(-60, 120)) if rng.random() < 0.7 else None
+        tasks.append({
+            'id': 1_700_000_000 + i,
+            'text': f"Task {i} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))),
+            'completed': completed,
+            'category': rng.choice(CATEGORIES),
+            'priority': rng.choice(list(PRIORITY_ORDER)),
+            'due_date': due_date.isoformat() if due_date else None,
+            'created_at': datetime(2024, 12, 1).isoformat(),
+            'completed_at': datetime(2024, 12, 15).isoformat() if completed else None
+        })
+    return tasks
+
+def measure(operation, repeat):
+    # Median and best of `repeat` runs
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'runs': repeat
+    }
+
+def write_dataset(directory, tasks):
+    data_file = os.path.join(directory, "todo_data.json")
+    with open(data_file, 'w') as f:
+        json.dump(tasks, f, indent=4)
+    return data_file
+
+def loaded_store(data_file, backend):
+    store, storage = open_store(data_file, backend)
+    storage.load_into(store)
+    return store, storage
+
+def bench_core(size, repeat, backend):
+    results = {}
+    tasks = generate_tasks(size)
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = write_dataset(directory, tasks)
+        store, storage = loaded_store(data_file, backend)  # also runs the one-shot SQLite migration
+        storage.close()
+
+        def load():
+            store, storage = loaded_store(data_file, backend)
+            len(store.query("All"))
+            storage.close()
+        results['load_data'] = measure(load, repeat)
+
+        store, storage = loaded_store(data_file, backend)
+        rng = random.Random(size)
+        task_ids = [task['id'] for task in tasks]
+
+        def save():
+            # An in-place edit, so both backends really write the row (SQLite only commits in append)
+            task = store.get(rng.choice(task_ids))
+            task.update({'text': task.text})
+            store.update(task)
+            storage.append(changed=[task])
+        results['save_data'] = measure(save, repeat)
+
+        def filtered():
+            for category in ["All"] + CATEGORIES:
+                view = store.query(category)
+                # What the virtual list touches: the length plus one screenful of rows
+                [view[i] for i in range(min(len(view), 10))]
+        results['get_filtered_tasks'] = measure(filtered, repeat)
+
+        def toggle():
+            task = store.get(rng.choice(task_ids))
+            set_completed(task, not task.completed)
+            store.update(task)
+            storage.append(changed=[task])
+        results['toggle_task'] = measure(toggle, repeat)
+
+        if backend == "journal":
+            results['compact_snapshot'] = measure(lambda: storage.write_snapshot([t.copy() for t in store]), max(1, repeat // 5))
+        storage.close()
+    return results
+
+def bench_gui(size, repeat):
+    todo_app = load_app_module()
+    results = {}
+    tasks = generate_tasks(size)
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_dataset(directory, tasks)
+        os.chdir(directory)
+        try:
+            start = time.perf_counter()
+            app = todo_app.TodoApp()
+            app.update()
+            results['startup'] = {'median_ms': round((time.perf_counter() - start) * 1000, 3), 'min_ms': None, 'runs': 1}
+
+            def timed(operation):
+                def run():
+                    operation()
+                    app.update_idletasks()
+                return run
+
+            rng = random.Random(size)
+            task_ids = [task['id'] for task in tasks]
+            results['load_data'] = measure(timed(app.load_data), max(1, repeat // 5))
+            results['get_filtered_tasks'] = measure(timed(lambda: len(app.get_filtered_tasks())), repeat)
+            results['refresh_task_display'] = measure(timed(app.refresh_task_display), repeat)
+            results['toggle_task'] = measure(timed(lambda: app.toggle_task(rng.choice(task_ids))), repeat)
+
+            # save_data only queues; time until the save worker has written it, without its debounce wait
+            debounce, todo_core.SAVE_DEBOUNCE_SECONDS = todo_core.SAVE_DEBOUNCE_SECONDS, 0
+            app.save_worker.requests.join()
+
+            def save():
+                app.save_data(changed=[app.store.get(rng.choice(task_ids))])
+                app.save_worker.requests.join()
+            results['save_data'] = measure(timed(save), repeat)
+            todo_core.SAVE_DEBOUNCE_SECONDS = debounce
+            app.on_close()
+        finally:
+            os.chdir(previous_dir)
+    return results
+
+def load_app_module():
+    # The app lives in "to do list.py", which cannot be imported by name
+    spec = importlib.util.spec_from_file_location("todo_app", os.path.join(ROOT, "to do list.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def start_virtual_display():
+    # Returns the Xvfb process we started, or None if a display is already available
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("GUI benchmarks need an X display or Xvfb on PATH")
+    display = ":%d" % (99 + os.getpid() % 100)
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    os.environ["DISPLAY"] = display
+    return process
+
+def compare(results, baseline_file, threshold):
+    with open(baseline_file) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for key, result in sorted(results.items()):
+        before = baseline.get(key)
+        if not before or not before['median_ms']:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms']
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{key:<48}{before['median_ms']:>12.3f}{result['median_ms']:>12.3f}{change:>+9.1%}  {marker}")
+        if marker:
+            regressions.append(key)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TodoMaster at scale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per operation (default: %(default)s)")
+    parser.add_argument("--backends", nargs="+", choices=["journal", "sqlite"], default=["journal", "sqlite"])
+    parser.add_argument("--gui", action="store_true", help="also benchmark the Tk window (uses Xvfb when there is no display)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression (default: 20%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        for backend in args.backends:
+            for operation, result in bench_core(size, args.repeat, backend).items():
+                results[f"core-{backend}/{operation}/{size}"] = result
+                print(f"core-{backend:<8}{operation:<22}{size:>8}{result['median_ms']:>12.3f} ms")
+
+    if args.gui:
+        xvfb = start_virtual_display()
+        try:
+            for size in args.sizes:
+                for operation, result in bench_gui(size, args.repeat).items():
+                    results[f"gui/{operation}/{size}"] = result
+                    print(f"gui{'':<13}{operation:<22}{size:>8}{result['median_ms']:>12.3f} ms")
+        finally:
+            if xvfb is not None:
+                xvfb.terminate()
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat
+            },
+            'results': results
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} operation(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+# Tests for the headless core: journal persistence and merging, ids, compaction, filtering and search.
+#
+#   python -m pytest tests
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import todo_core
+from todo_core import (
+    CATEGORIES, STATUS_FILTERS, SaveWorker, SearchIndex, SearchView, TaskStore,
+    create_task, import_tasks, open_store, set_completed
+)
+
+def open_journal(data_file):
+    store, storage = open_store(str(data_file), "journal")
+    storage.load_into(store)
+    return store, storage
+
+def reopen(data_file):
+    store, storage = open_journal(data_file)
+    storage.close()
+    return store
+
+def write_snapshot_file(data_file, records):
+    with open(data_file, 'w') as f:
+        json.dump(records, f)
+
+def make_tasks(store, count):
+    words = ["buy", "milk", "call", "mom", "write", "report", "bike", "book"]
+    tasks = []
+    for i in range(count):
+        text = f"Task {i} {words[i % len(words)]} {words[(i * 3) % len(words)]}"
+        task = create_task(store, text, CATEGORIES[i % len(CATEGORIES)], "High" if i % 3 else "Low")
+        task.completed = i % 4 == 0
+        tasks.append(task)
+    first = store.new_ids(count)
+    for offset, task in enumerate(tasks):
+        task.id = first + offset
+    store.load(tasks)
+    return tasks
+
+# --- Journal replay and merging ---
+def test_appended_records_survive_a_reload(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    keep, drop = create_task(store, "keep", "Work", "High"), create_task(store, "drop", "Work", "Low")
+    store.add(keep)
+    store.add(drop)
+    storage.append(changed=[keep, drop])
+    set_completed(keep, True)
+    storage.append(changed=[keep], deleted=[drop.id])
+    storage.close()
+
+    reloaded = reopen(data_file)
+    assert [(task.text, task.completed) for task in reloaded] == [("keep", True)]
+
+def test_replay_keeps_the_newest_version_of_a_task(tmp_path):
+    store, storage = open_journal(tmp_path / "todo_data.json")
+    task = create_task(store, "original", "Work", "High")
+    store.add(task)
+    newer, older = task.copy(), task.copy()
+    newer.text, newer.updated_at = "newer", task.updated_at + timedelta(seconds=10)
+    older.text, older.updated_at = "older", task.updated_at - timedelta(seconds=10)
+
+    assert storage.replay(store, {'put': newer.to_dict()})
+    assert not storage.replay(store, {'put': older.to_dict()})
+    assert store.get(task.id).text == "newer"
+    storage.close()
+
+def test_delete_is_not_undone_by_an_older_put(tmp_path):
+    store, storage = open_journal(tmp_path / "todo_data.json")
+    task = create_task(store, "gone", "Work", "High")
+    store.add(task)
+    stale = task.to_dict()
+    deleted_at = (task.updated_at + timedelta(seconds=1)).isoformat()
+
+    assert storage.replay(store, {'del': task.id, 'at': deleted_at})
+    assert not storage.replay(store, {'put': stale})
+    assert store.get(task.id) is None
+    storage.close()
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    task = create_task(store, "whole", "Work", "High")
+    storage.append(changed=[task])
+    storage.close()
+    with open(str(data_file) + ".journal", 'ab') as f:
+        f.write(b'{"put": {"id": 1, "te')
+
+    assert [task.text for task in reopen(data_file)] == ["whole"]
+    with open(str(data_file) + ".journal", 'rb') as f:
+        assert f.read().endswith(b"\n")
+
+def test_poll_merges_records_from_another_instance(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    other_store, other_storage = open_journal(data_file)
+    task = create_task(other_store, "from elsewhere", "Work", "High")
+    other_store.add(task)
+    other_storage.append(changed=[task])
+
+    assert storage.poll(store) == ([task.id], [])
+    assert storage.poll(store) is None
+    other_storage.append(deleted=[task.id])
+    assert storage.poll(store) == ([], [task.id])
+    storage.close()
+    other_storage.close()
+
+# --- Ids ---
+def test_instances_sharing_a_file_never_hand_out_the_same_id(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    first_store, first_storage = open_journal(data_file)
+    second_store, second_storage = open_journal(data_file)
+    ids = [first_store.new_id(), second_store.new_id(), first_store.new_ids(5), second_store.new_id()]
+    assert ids[1] > ids[0] and ids[2] > ids[1] and ids[3] >= ids[2] + 5
+    first_storage.close()
+    second_storage.close()
+
+def test_renumbered_duplicate_ids_are_persisted(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    write_snapshot_file(data_file, [
+        {'id': 100, 'text': "A", 'completed': False, 'category': "Work", 'priority': "High"},
+        {'id': 100, 'text': "B", 'completed': False, 'category': "Work", 'priority': "High"},
+    ])
+    store, storage = open_journal(data_file)
+    b = next(task for task in store if task.text == "B")
+    set_completed(b, True)
+    store.update(b)
+    storage.append(changed=[b])
+    storage.close()
+
+    for _ in range(2):
+        reloaded = sorted((task.id, task.text, task.completed) for task in reopen(data_file))
+        assert reloaded == [(100, "A", False), (b.id, "B", True)]
+
+# --- Compaction ---
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    tasks = make_tasks(store, 50)
+    storage.append(changed=tasks)
+    storage.compact(store)
+    storage.compactor.join()
+
+    assert not os.path.exists(storage.journal_file)
+    storage.close()
+    assert sorted(task.id for task in reopen(data_file)) == sorted(task.id for task in tasks)
+
+def test_compaction_leaves_the_journal_when_it_changed_after_the_copy(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    first = create_task(store, "first", "Work", "High")
+    store.add(first)
+    storage.append(changed=[first])
+    expected = todo_core.file_state(storage.journal_file)
+    late = create_task(store, "late", "Work", "High")
+    store.add(late)
+    storage.append(changed=[late])
+
+    storage.write_snapshot([first.copy()], expected)
+    assert os.path.exists(storage.journal_file)
+    storage.close()
+    assert sorted(task.text for task in reopen(data_file)) == ["first", "late"]
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to list open files")
+def test_no_journal_handle_stays_open_between_appends(tmp_path):
+    # On Windows an open handle in any instance would make compaction's os.remove fail
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    storage.append(changed=[create_task(store, "one", "Work", "High")])
+    open_files = {os.path.realpath(os.path.join("/proc/self/fd", fd)) for fd in os.listdir("/proc/self/fd")}
+    assert os.path.realpath(storage.journal_file) not in open_files
+    storage.close()
+
+def test_failed_compaction_does_not_drop_the_next_write(tmp_path):
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    storage.compaction_error = OSError("disk full")
+    worker = SaveWorker(storage)
+    task = create_task(store, "still saved", "Work", "High")
+    store.add(task)
+    worker.submit(changed=[task])
+    worker.close()
+    storage.close()
+
+    assert [kind for kind, payload in worker.events.queue] == ['error']
+    assert [task.text for task in reopen(data_file)] == ["still saved"]
+
+# --- Save worker ---
+def test_save_worker_retries_a_failed_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(todo_core, "SAVE_DEBOUNCE_SECONDS", 0)
+    monkeypatch.setattr(todo_core, "SAVE_RETRY_SECONDS", 0.05)
+    data_file = tmp_path / "todo_data.json"
+    store, storage = open_journal(data_file)
+    append, failures = storage.append, [1]
+
+    def flaky_append(*args, **kwargs):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("disk full")
+        append(*args, **kwargs)
+    storage.append = flaky_append
+
+    worker = SaveWorker(storage)
+    task = create_task(store, "retried", "Work", "High")
+    worker.submit(changed=[task])
+    deadline = time.monotonic() + 5
+    while not worker.idle() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.close()
+    storage.close()
+
+    assert worker.idle()
+    assert [task.text for task in reopen(data_file)] == ["retried"]
+
+# --- Import ---
+def test_import_skips_rows_with_odd_json_types(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    rows = [
+        {'text': "first", 'category': "Work"},
+        {'text': "list priority", 'category': "Work", 'priority': ["High"]},
+        {'text': "dict category", 'category': {'name': "Work"}},
+        {'text': "last", 'category': "Work", 'priority': "Low"},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+    results = [(task.text if task else None, error) for _, _, task, error in import_tasks(str(path), CATEGORIES)]
+    assert [text for text, error in results] == ["first", None, None, "last"]
+    assert all(error for text, error in results[1:3])
+
+# --- Filtering and search ---
+def test_search_filter_matches_a_plain_walk_of_the_view():
+    store = TaskStore()
+    make_tasks(store, 3000)
+    index = SearchIndex(store.iter_text())
+    for query in ["task", "b", "1", "12", "buy milk", "task 2999", "nothing"]:
+        task_ids = index.search(query)
+        for category in ["All"] + CATEGORIES:
+            for status in STATUS_FILTERS:
+                expected = [task for task in store.filter(category, status) if task.id in task_ids]
+                result = store.filter(category, status, task_ids)
+                assert len(result) == len(expected)
+                assert list(result) == expected
+
+def test_broad_search_is_paged_lazily():
+    store = TaskStore()
+    make_tasks(store, 3000)
+    result = store.filter("All", "Active", SearchIndex(store.iter_text()).search("task"))
+    assert isinstance(result, SearchView)
+    assert result[0] is store.filter("All", "Active")[0]
+    assert len(result.matches) < len(result)
+
+def test_search_index_prefix_matching():
+    index = SearchIndex([(1, "Buy milk"), (2, "Call mom"), (3, "Buy bread")])
+    assert index.search("bu") == {1, 3}
+    assert index.search("buy m") == {1}
+    assert index.search("MOM") == {2}
+    assert index.search("zzz") == set()
+    index.update(2, "Buy stamps")
+    index.remove(1)
+    assert index.search("buy") == {2, 3}
+    assert index.vocabulary == sorted(index.postings)
+
+def test_chunked_build_keeps_changes_made_meanwhile():
+    store = TaskStore()
+    tasks = make_tasks(store, 2500)
+    index = SearchIndex()
+    build = index.build(list(store.iter_text()), chunk_size=500)
+    edited, removed = tasks[0], tasks[-1]
+    edited.text = "zebra"
+    index.update(edited.id, edited.text)
+    next(build)
+    index.remove(removed.id)
+    store.remove(removed.id)
+    for _ in build:
+        pass
+
+    full = SearchIndex(store.iter_text())
+    assert index.postings == full.postings
+    assert index.vocabulary == full.vocabulary
+    assert index.search("zebra") == {edited.id}
@@ -1,10 +1,242 @@
+import time
+MODULE_START = time.perf_counter()  # taken before the GUI imports so the startup breakdown includes them
+
 import customtkinter as ctk
-from tkinter import messagebox
-from datetime import datetime
+from tkinter import filedialog, messagebox
+from datetime import datetime, timedelta
+import atexit
+import cProfile
+import collections
+import contextlib
+import itertools
 import json
+import math
 import os
-from PIL import Image
-from tkcalendar import Calendar # Import the Calendar widget
+import sys
+import threading
+import tkinter
+import weakref
+
+from todo_core import (
+    CATEGORIES, IMPORT_BATCH_SIZE, STATUS_FILTERS, DueTracker, ReminderQueue, SaveWorker, SearchIndex,
+    create_task, due_label, export_tasks, import_tasks, open_store, set_completed
+)
+
+# Virtualized task list geometry (pixels before widget scaling)
+ROW_HEIGHT = 98
+ROW_GAP = 10
+SCROLL_STEP = 40
+
+# How often the Tk thread picks up results from the background save worker
+SAVE_POLL_MS = 250
+
+# How often the data files are checked for changes made by other TodoMaster windows
+WATCH_POLL_MS = 1000
+
+# Invalid import rows listed in the summary; the rest are only counted
+IMPORT_ERRORS_SHOWN = 5
+
+# Search runs once typing pauses for this long
+SEARCH_DEBOUNCE_MS = 150
+
+# The reminder timer is re-armed at least this often, so clock changes and sleep are picked up
+REMINDER_MAX_WAIT_MS = 60 * 60 * 1000
+REMINDER_TOAST_MS = 8000
+
+# Print a time-to-first-paint breakdown with --startup-timing or TODOMASTER_STARTUP_TIMING=1
+STARTUP_TIMING = "--startup-timing" in sys.argv or os.environ.get("TODOMASTER_STARTUP_TIMING") == "1"
+
+# Time the hot paths with --profile or TODOMASTER_PROFILE=1 (F12 shows the overlay);
+# --cprofile or TODOMASTER_PROFILE=cprofile also runs the whole session under cProfile
+CPROFILE = "--cprofile" in sys.argv or os.environ.get("TODOMASTER_PROFILE") == "cprofile"
+PROFILE = CPROFILE or "--profile" in sys.argv or os.environ.get("TODOMASTER_PROFILE") == "1"
+PROFILE_TRACE_FILE = "todo_profile.json"
+PROFILE_STATS_FILE = "todo_profile.prof"
+PROFILE_SAMPLES = 1000  # recent calls per operation that the percentiles are taken over
+PROFILE_EVENTS = 100000  # calls kept for the trace
+PROFILE_OVERLAY_MS = 1000
+
+# Icon name -> (file in icons/, display size or None for CTkImage's default)
+ICON_FILES = {
+    "logo": ("logo.png", (28, 28)),
+    "All": ("home.png", None),
+    "Personal": ("user.png", None),
+    "Work": ("briefcase.png", None),
+    "Shopping": ("shopping-cart.png", None),
+    "Health": ("heart-pulse.png", None),
+    "Education": ("book-marked.png", None),
+    "add": ("plus.png", None),
+    "edit": ("edit.png", (16, 16)),
+    "delete": ("delete.png", (16, 16)),
+    "calendar": ("calendar.png", None),
+    "no_tasks": ("no-tasks.png", (200, 200)),
+}
+
+# --- Records how long each startup phase took ---
+class StartupTimer:
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = ["Startup breakdown:"]
+        lines += [f"  {phase:<14}{seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"  {'total':<14}{(self.last - self.start) * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+# --- Opt-in instrumentation: call timings, widget churn and an optional cProfile run ---
+class Profiler:
+    def __init__(self, use_cprofile=False):
+        self.start = time.perf_counter()
+        self.samples = {}  # operation -> durations of its most recent calls, in seconds
+        self.calls = collections.Counter()
+        self.widget_churn = {}  # operation -> (created, destroyed) during its last call
+        self.events = collections.deque(maxlen=PROFILE_EVENTS)
+        self.widgets_created = 0
+        self.widgets_destroyed = 0
+        self.cprofile = None
+        self.closed = False
+        if use_cprofile:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+        # Every Tk widget goes through BaseWidget (a CustomTkinter widget is built from several)
+        self.widget_init, self.widget_destroy = tkinter.BaseWidget.__init__, tkinter.BaseWidget.destroy
+        profiler = self
+
+        def counted_init(widget, *args, **kwargs):
+            profiler.widgets_created += 1
+            profiler.widget_init(widget, *args, **kwargs)
+
+        def counted_destroy(widget):
+            profiler.widgets_destroyed += 1
+            profiler.widget_destroy(widget)
+
+        tkinter.BaseWidget.__init__ = counted_init
+        tkinter.BaseWidget.destroy = counted_destroy
+
+    @contextlib.contextmanager
+    def span(self, operation):
+        created, destroyed = self.widgets_created, self.widgets_destroyed
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            churn = (self.widgets_created - created, self.widgets_destroyed - destroyed)
+            self.samples.setdefault(operation, collections.deque(maxlen=PROFILE_SAMPLES)).append(duration)
+            self.calls[operation] += 1
+            self.widget_churn[operation] = churn
+            # Chrome trace events, so the dump opens in chrome://tracing or Perfetto
+            self.events.append({
+                'name': operation, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': round((start - self.start) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                'args': {'widgets_created': churn[0], 'widgets_destroyed': churn[1]}
+            })
+
+    def instrument(self, target, *names, prefix=""):
+        # Shadows the methods on this one object, so callbacks wired up afterwards get the timed version
+        for name in names:
+            method = getattr(target, name)
+
+            def timed(*args, operation=prefix + name, method=method, **kwargs):
+                with self.span(operation):
+                    return method(*args, **kwargs)
+            setattr(target, name, timed)
+
+    def summary(self):
+        result = {}
+        for operation, samples in list(self.samples.items()):
+            ordered = sorted(samples)
+            created, destroyed = self.widget_churn[operation]
+            result[operation] = {
+                'calls': self.calls[operation],
+                'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+                'widgets_created': created,
+                'widgets_destroyed': destroyed
+            }
+        return result
+
+    def report(self):
+        lines = [f"{'operation':<26}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}"]
+        for operation, stats in sorted(self.summary().items()):
+            lines.append(f"{operation:<26}{stats['calls']:>7}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}")
+        created, destroyed = self.widget_churn.get("refresh_task_display", (0, 0))
+        lines.append(f"widgets last refresh +{created} -{destroyed}, total +{self.widgets_created} -{self.widgets_destroyed}")
+        return "\n".join(lines)
+
+    def close(self, trace_file, stats_file):
+        if self.closed:
+            return
+        self.closed = True
+        tkinter.BaseWidget.__init__, tkinter.BaseWidget.destroy = self.widget_init, self.widget_destroy
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(stats_file)
+            print(f"cProfile stats written to {stats_file} (python -m pstats {stats_file})")
+        with open(trace_file, 'w') as f:
+            json.dump({
+                'traceEvents': list(self.events),
+                'displayTimeUnit': 'ms',
+                'summary': self.summary(),
+                'widgets': {'created': self.widgets_created, 'destroyed': self.widgets_destroyed}
+            }, f)
+        print(f"Profile trace written to {trace_file}")
+
+def percentile(ordered, fraction):
+    # Nearest-rank percentile of an already sorted, non-empty list
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+# --- Icons are decoded on first use and memoized ---
+class IconCache:
+    def __init__(self, icon_path):
+        self.icon_path = icon_path
+        self.images = {}
+
+    def missing_files(self):
+        return [name for name, _ in ICON_FILES.values() if not os.path.exists(os.path.join(self.icon_path, name))]
+
+    def __getitem__(self, name):
+        if name not in self.images:
+            from PIL import Image
+            file_name, size = ICON_FILES[name]
+            image = Image.open(os.path.join(self.icon_path, file_name))
+            self.images[name] = ctk.CTkImage(image, size=size) if size else ctk.CTkImage(image)
+        return self.images[name]
+
+    def get(self, name, default=None):
+        return self[name] if name in ICON_FILES else default
+
+# Task row priority bar color role per priority
+PRIORITY_ROLES = {'High': 'danger', 'Medium': 'warning', 'Low': 'success'}
+
+# --- Which color role each widget option is drawn with; a theme switch reconfigures them in one pass ---
+class ThemeRegistry:
+    def __init__(self, colors):
+        self.colors = colors
+        self.bindings = weakref.WeakKeyDictionary()  # widget -> {option: role}; closed dialogs drop out
+
+    def bind(self, widget, **roles):
+        # Roles are keys of the colors dict; anything else (e.g. "transparent") is passed through as is
+        bound = self.bindings.setdefault(widget, {})
+        changed = {option: role for option, role in roles.items() if bound.get(option) != role}
+        if changed:
+            bound.update(changed)
+            widget.configure(**{option: self.colors.get(role, role) for option, role in changed.items()})
+
+    def apply(self, colors):
+        self.colors = colors
+        for widget, roles in list(self.bindings.items()):
+            if widget.winfo_exists():
+                widget.configure(**{option: colors.get(role, role) for option, role in roles.items()})
 
 # --- TaskDialog for a professional Add/Edit experience ---
 class TaskDialog(ctk.CTkToplevel):
@@ -20,7 +252,7 @@ class TaskDialog(ctk.CTkToplevel):
         self.icons = icons
         self.categories = parent.categories[1:] # Exclude "All"
 
-        self.configure(fg_color=parent.colors['bg_secondary'])
+        parent.theme.bind(self, fg_color='bg_secondary')
 
         ctk.CTkLabel(self, text=title, font=("Inter", 20, "bold")).pack(pady=(20, 10))
 
@@ -58,7 +290,9 @@ class TaskDialog(ctk.CTkToplevel):
         button_frame = ctk.CTkFrame(self, fg_color="transparent")
         button_frame.pack(fill="x", padx=30, pady=30)
 
-        ctk.CTkButton(button_frame, text="Cancel", command=self.cancel, height=40, fg_color=parent.colors['bg_tertiary'], text_color=parent.colors['text_primary'], hover_color=parent.colors['border']).pack(side="left", expand=True, padx=(0, 5))
+        cancel_btn = ctk.CTkButton(button_frame, text="Cancel", command=self.cancel, height=40)
+        parent.theme.bind(cancel_btn, fg_color='bg_tertiary', text_color='text_primary', hover_color='border')
+        cancel_btn.pack(side="left", expand=True, padx=(0, 5))
         ctk.CTkButton(button_frame, text="Save Task", command=self.save, height=40, font=("Inter", 14, "bold")).pack(side="right", expand=True, padx=(5, 0))
 
         if task_data:
@@ -68,6 +302,7 @@ class TaskDialog(ctk.CTkToplevel):
         self.grab_set()
 
     def open_calendar(self):
+        from tkcalendar import Calendar # Deferred: only the date picker needs it
         cal_win = ctk.CTkToplevel(self)
         cal_win.title("Select Date")
         cal_win.grab_set()
@@ -90,10 +325,10 @@ class TaskDialog(ctk.CTkToplevel):
         cal.bind("<<CalendarSelected>>", on_date_select)
     
     def populate_data(self, data):
-        self.entry_task.insert(0, data['text'])
-        self.category_var.set(data['category'])
-        self.priority_var.set(data['priority'])
-        self.due_date_var.set(data.get('due_date', ''))
+        self.entry_task.insert(0, data.text)
+        self.category_var.set(data.category)
+        self.priority_var.set(data.priority)
+        self.due_date_var.set(data.due_date or '')
 
     def save(self):
         task_text = self.entry_task.get().strip()
@@ -121,26 +356,442 @@ class TaskDialog(ctk.CTkToplevel):
         self.result = None
         self.destroy()
 
+    def destroy(self):
+        with self.master.profile("dialog close"):
+            super().destroy()
+
+# --- Modal progress window for long-running imports and exports ---
+class ProgressDialog(ctk.CTkToplevel):
+    def __init__(self, parent, title):
+        super().__init__(parent)
+        self.transient(parent)
+        self.title(title)
+        self.geometry("380x170")
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.cancelled = False
+        parent.theme.bind(self, fg_color='bg_secondary')
+
+        ctk.CTkLabel(self, text=title, font=("Inter", 16, "bold")).pack(pady=(20, 10))
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=30)
+        self.status_label = ctk.CTkLabel(self, text="Starting...", font=("Inter", 12))
+        parent.theme.bind(self.status_label, text_color='text_secondary')
+        self.status_label.pack(pady=(5, 10))
+
+        cancel_btn = ctk.CTkButton(self, text="Cancel", command=self.cancel, height=32)
+        parent.theme.bind(cancel_btn, fg_color='bg_tertiary', text_color='text_primary', hover_color='border')
+        cancel_btn.pack()
+        self.grab_set()
+
+    def update_progress(self, fraction, text):
+        self.progress_bar.set(fraction)
+        self.status_label.configure(text=text)
+
+    def cancel(self):
+        self.cancelled = True
+
+# --- A single recyclable task row; rebound to different tasks as the list scrolls ---
+class TaskRow(ctk.CTkFrame):
+    def __init__(self, master, app):
+        super().__init__(master, height=ROW_HEIGHT - ROW_GAP, border_width=1)
+        self.pack_propagate(False)
+        self.app = app
+        self.task = None
+        self.rendered = {}
+
+        self.priority_bar = ctk.CTkFrame(self, width=5, corner_radius=0)
+        self.priority_bar.pack(side="left", fill="y")
+
+        content_frame = ctk.CTkFrame(self, fg_color="transparent")
+        content_frame.pack(side="left", fill="x", expand=True, padx=15, pady=10)
+
+        top_row = ctk.CTkFrame(content_frame, fg_color="transparent")
+        top_row.pack(fill="x")
+
+        self.checkbox = ctk.CTkCheckBox(
+            top_row, text="", command=lambda: self.app.toggle_task(self.task.id),
+            onvalue=True, offvalue=False
+        )
+        self.checkbox.pack(side="left", padx=(0, 10))
+
+        self.task_label = ctk.CTkLabel(top_row, text="", anchor="w", wraplength=500)
+        self.task_label.pack(side="left", fill="x", expand=True)
+
+        bottom_row = ctk.CTkFrame(content_frame, fg_color="transparent")
+        bottom_row.pack(fill="x", pady=(8, 0))
+
+        self.due_label = ctk.CTkLabel(bottom_row, text="", font=app.small_font)
+        self.due_label.pack(side="left", padx=(34, 10))
+
+        actions_frame = ctk.CTkFrame(self, fg_color="transparent")
+        actions_frame.pack(side="right", padx=15)
+
+        edit_btn = ctk.CTkButton(actions_frame, text="", image=app.icons['edit'], width=30, height=30, command=lambda: self.app.show_edit_task_dialog(self.task))
+        edit_btn.pack(pady=(0,5))
+
+        self.delete_btn = ctk.CTkButton(actions_frame, text="", image=app.icons['delete'], width=30, height=30, hover_color="#B33A3A", command=lambda: self.app.delete_task(self.task.id))
+        self.delete_btn.pack()
+
+        app.theme.bind(self, fg_color='bg_secondary', border_color='border')
+        app.theme.bind(self.delete_btn, fg_color='danger')
+
+    def bind_task(self, task):
+        self.task = task
+        theme = self.app.theme
+        theme.bind(self.priority_bar, fg_color=PRIORITY_ROLES[task.priority])
+
+        if task.completed != bool(self.checkbox.get()):
+            if task.completed:
+                self.checkbox.select()
+            else:
+                self.checkbox.deselect()
+
+        strike_font = ("Inter", 15, "overstrike") if task.completed else ("Inter", 15)
+        self.patch(self.task_label, text=task.text, font=strike_font)
+        theme.bind(self.task_label, text_color='text_secondary' if task.completed else 'text_primary')
+
+        due_text, due_role = self.app.describe_due_date(task)
+        self.patch(self.due_label, text=due_text)
+        theme.bind(self.due_label, text_color=due_role)
+
+    def patch(self, widget, **options):
+        # Only reconfigure options that differ from what this row last rendered; colors go through the theme
+        rendered = self.rendered.setdefault(str(widget), {})
+        changed = {key: value for key, value in options.items() if rendered.get(key) != value}
+        if changed:
+            widget.configure(**changed)
+            rendered.update(changed)
+
+# --- Virtualized task list: only enough rows to fill the viewport are ever built ---
+class VirtualTaskList(ctk.CTkFrame):
+    def __init__(self, master, row_factory, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_factory = row_factory
+        self.items = []
+        self.row_of = {}
+        self.rows = []
+        self.offset = 0
+        self.viewport_height = 0
+        self.scaling = 1
+        self.row_pixels = ROW_HEIGHT
+        self.update_scaling()
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport.bind("<Configure>", self.on_resize)
+        self.bind_all("<MouseWheel>", self.on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self.on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self.on_mouse_wheel, add="+")
+
+    def set_items(self, items):
+        # items is a live, ordered view (e.g. a TaskStore bucket) that is re-read on every render
+        self.items = items
+        self.render()
+
+    def refresh_row(self, task_id):
+        # Patch one on-screen row in place; a no-op if the task is scrolled out of view
+        row = self.row_of.get(task_id)
+        if row is not None:
+            row.bind_task(row.task)
+
+    def update_scaling(self):
+        # offset and row_pixels are screen pixels; re-read the scaling so a DPI change is picked up
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        if scaling != self.scaling:
+            row_pixels = round(ROW_HEIGHT * scaling)
+            self.offset = self.offset * row_pixels // self.row_pixels
+            self.scaling, self.row_pixels = scaling, row_pixels
+
+    def on_resize(self, event):
+        self.update_scaling()
+        self.viewport_height = event.height
+        pool_size = math.ceil(event.height / self.row_pixels) + 1
+        while len(self.rows) < pool_size:
+            self.rows.append(self.row_factory(self.viewport))
+        self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * len(self.items) * self.row_pixels)
+        elif action == "scroll":
+            step = self.viewport_height if unit == "pages" else SCROLL_STEP
+            self.scroll_to(self.offset + int(float(value)) * step)
+
+    def on_mouse_wheel(self, event):
+        # bind_all sees every wheel event in the app; only react inside our viewport
+        if not str(event.widget).startswith(str(self.viewport)):
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -event.delta / 120
+        self.scroll_to(self.offset + steps * SCROLL_STEP)
+
+    def scroll_to(self, offset):
+        self.offset = int(offset)
+        self.render()
+
+    def render(self):
+        total_height = len(self.items) * self.row_pixels
+        self.offset = min(max(self.offset, 0), max(0, total_height - self.viewport_height))
+
+        first = self.offset // self.row_pixels
+        shift = self.offset % self.row_pixels
+        self.row_of = {}
+        for slot, row in enumerate(self.rows):
+            index = first + slot
+            if index < len(self.items):
+                row.bind_task(self.items[index])
+                self.row_of[row.task.id] = row
+                # CTk's place() scales x/y again, so hand it unscaled values
+                row.place(x=0, y=(slot * self.row_pixels - shift) / self.scaling, relwidth=1)
+            else:
+                row.place_forget()
+
+        if total_height:
+            self.scrollbar.set(self.offset / total_height, min(1, (self.offset + self.viewport_height) / total_height))
+        else:
+            self.scrollbar.set(0, 1)
+
 # --- MAIN APPLICATION ---
 class TodoApp(ctk.CTk):
     def __init__(self):
+        self.startup_timer = StartupTimer(MODULE_START)
+        self.startup_timer.mark("imports")
+        self.profiler = Profiler(CPROFILE) if PROFILE else None
+        if self.profiler:
+            # Also covers exits that skip on_close (e.g. Ctrl+C in the terminal)
+            atexit.register(self.profiler.close, PROFILE_TRACE_FILE, PROFILE_STATS_FILE)
         super().__init__()
         self.title("TodoMaster Pro")
         self.geometry("1100x750")
         self.resizable(True, True)
         self.minsize(900, 600)
         
-        self.tasks = []
-        self.categories = ["All", "Personal", "Work", "Shopping", "Health", "Education"]
+        self.categories = ["All"] + CATEGORIES
         self.current_category = "All"
+        self.status_filter = "All"
+        self.search_query = ""
+        self.search_index = None  # built on first use, then kept in step with every change
+        self.search_build = None  # the chunked build of search_index while it is still running
+        self.search_job = None
+        self.due_tracker = DueTracker()  # rebuilt by load_data, rolled over by on_midnight
+        self.reminders = ReminderQueue()
+        self.reminder_job = None
+        self.toast_frame = None
+        self.toast_job = None
         self.data_file = "todo_data.json"
+        self.importing = False
+        self.exporting = False
+        self.store, self.storage = open_store(self.data_file)
+        self.save_worker = SaveWorker(self.storage)
+        atexit.register(self.save_worker.close)
+        if self.profiler:
+            # Before any widget is built, so the row factory and button commands bind the timed methods
+            self.profiler.instrument(self, "refresh_task_display", "create_task_widget", "get_filtered_tasks", "save_data", "load_data")
+            self.profiler.instrument(self.storage, "append", prefix="storage.")
+        self.startup_timer.mark("window")
         
         self.setup_styles_and_theme()
         
         self.load_icons()
+        self.startup_timer.mark("icons")
         self.create_widgets()
+        if self.profiler:
+            self.create_profile_overlay()
+        self.startup_timer.mark("widgets")
         self.load_data()
-        self.apply_colors()
+        self.startup_timer.mark("load data")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(SAVE_POLL_MS, self.poll_save_worker)
+        self.after(WATCH_POLL_MS, self.poll_storage)
+        self.schedule_midnight()
+        self.after_idle(self.on_first_paint)
+
+    def on_first_paint(self):
+        self.startup_timer.mark("first paint")
+        if STARTUP_TIMING:
+            print(self.startup_timer.report())
+
+    def on_close(self):
+        self.save_worker.close()
+        self.poll_save_worker(reschedule=False)
+        self.storage.close()
+        if self.profiler:
+            self.profiler.close(PROFILE_TRACE_FILE, PROFILE_STATS_FILE)
+        self.destroy()
+
+    def poll_save_worker(self, reschedule=True):
+        # Rescheduled first; the merge before a compaction reads files other instances write
+        if reschedule:
+            self.after(SAVE_POLL_MS, self.poll_save_worker)
+        while not self.save_worker.events.empty():
+            kind, payload = self.save_worker.events.get()
+            if kind == 'compact':
+                # A bulk import would trigger a compaction every few batches; the worker asks again later
+                if not self.importing:
+                    self.sync_storage()
+                    self.storage.compact(self.store)
+            else:
+                messagebox.showerror("Error", f"Failed to save data: {str(payload)}")
+
+    def schedule_midnight(self):
+        # One timer per day; the extra second keeps it from firing just before the date changes
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.after(int((midnight - now).total_seconds() * 1000) + 1000, self.on_midnight)
+
+    def on_midnight(self):
+        if self.due_tracker.rollover():
+            # Every due label counts days from today, so rebind the visible rows that show one
+            for task_id, row in list(self.task_list.row_of.items()):
+                if row.task.due is not None:
+                    self.task_list.refresh_row(task_id)
+            self.update_due_summary()
+        self.schedule_midnight()
+
+    def arm_reminders(self):
+        # A single pending after() for the nearest reminder
+        if self.reminder_job is not None:
+            self.after_cancel(self.reminder_job)
+            self.reminder_job = None
+        fire_at = self.reminders.next_fire()
+        if fire_at is not None:
+            delay = min(max(0, int((fire_at - time.time()) * 1000)), REMINDER_MAX_WAIT_MS)
+            self.reminder_job = self.after(delay, self.fire_reminders)
+
+    def fire_reminders(self):
+        self.reminder_job = None
+        fired = self.reminders.pop_due()
+        if fired:
+            self.show_reminders(fired)
+        self.arm_reminders()
+
+    def show_reminders(self, fired):
+        # Everything that came due at once goes into one notification
+        overdue, due_today = [], []
+        for task_id, kind in fired:
+            task = self.store.get(task_id)
+            if task is not None:
+                (overdue if kind == 'overdue' else due_today).append(task)
+        if not overdue and not due_today:
+            return
+        parts = []
+        if overdue:
+            parts.append(f"{len(overdue)} overdue")
+        if due_today:
+            parts.append(f"{len(due_today)} due today")
+        tasks = overdue + due_today
+        lines = [f"• {task.text}" for task in tasks[:3]]
+        if len(tasks) > 3:
+            lines.append(f"and {len(tasks) - 3} more")
+
+        if self.toast_frame is None:
+            self.toast_frame = ctk.CTkFrame(self, corner_radius=10, border_width=1)
+            self.toast_title = ctk.CTkLabel(self.toast_frame, text="", font=("Inter", 14, "bold"), anchor="w")
+            self.toast_title.pack(fill="x", padx=15, pady=(10, 0))
+            self.toast_body = ctk.CTkLabel(self.toast_frame, text="", font=("Inter", 12), anchor="w", justify="left")
+            self.toast_body.pack(fill="x", padx=15, pady=(0, 10))
+            for widget in (self.toast_frame, self.toast_title, self.toast_body):
+                widget.bind("<Button-1>", lambda e: self.hide_toast())
+            self.theme.bind(self.toast_frame, fg_color='bg_secondary', border_color='border')
+            self.theme.bind(self.toast_body, text_color='text_primary')
+
+        self.toast_title.configure(text="Reminder: " + ", ".join(parts))
+        self.theme.bind(self.toast_title, text_color='danger' if overdue else 'warning')
+        self.toast_body.configure(text="\n".join(lines))
+        self.toast_frame.place(relx=1, rely=1, x=-20, y=-20, anchor="se")
+        self.toast_frame.lift()
+        self.bell()
+        if self.toast_job is not None:
+            self.after_cancel(self.toast_job)
+        self.toast_job = self.after(REMINDER_TOAST_MS, self.hide_toast)
+
+    def hide_toast(self):
+        self.toast_job = None
+        if self.toast_frame is not None:
+            self.toast_frame.place_forget()
+
+    def profile(self, operation):
+        # Times a block of code when profiling is on
+        return self.profiler.span(operation) if self.profiler else contextlib.nullcontext()
+
+    def create_profile_overlay(self):
+        self.profile_overlay = ctk.CTkLabel(self, text="", font=("Courier", 11), justify="left", anchor="nw", corner_radius=6)
+        self.theme.bind(self.profile_overlay, fg_color='bg_tertiary', text_color='text_primary')
+        self.profile_overlay_job = None
+        self.bind("<F12>", lambda e: self.toggle_profile_overlay())
+
+    def toggle_profile_overlay(self):
+        if self.profile_overlay_job is None:
+            self.profile_overlay.place(relx=1, rely=1, x=-10, y=-10, anchor="se")
+            self.profile_overlay.lift()
+            self.update_profile_overlay()
+        else:
+            self.after_cancel(self.profile_overlay_job)
+            self.profile_overlay_job = None
+            self.profile_overlay.place_forget()
+
+    def update_profile_overlay(self):
+        self.profile_overlay.configure(text=self.profiler.report())
+        self.profile_overlay_job = self.after(PROFILE_OVERLAY_MS, self.update_profile_overlay)
+
+    def poll_storage(self):
+        # Rescheduled first, so an error while merging cannot stop the watcher for the session
+        self.after(WATCH_POLL_MS, self.poll_storage)
+        self.sync_storage()
+
+    def sync_storage(self):
+        # Merging assumes our own changes are on disk, so wait while the worker still has some queued.
+        # An export walks the store across several ticks, so it must not change under it either.
+        if self.importing or self.exporting or not self.save_worker.idle():
+            return
+        changes = self.storage.poll(self.store)
+        if changes is not None:
+            self.apply_external_changes(*changes)
+
+    def apply_external_changes(self, changed, deleted):
+        if changed is None:
+            # The backend cannot tell which rows changed; rebuild everything derived from the tasks
+            self.reset_search_index()
+            self.due_tracker = DueTracker(self.store.iter_due())
+            self.update_due_summary()
+            self.reload_reminders()
+            self.refresh_task_display()
+            return
+        if not changed and not deleted:
+            return
+
+        for task_id in deleted:
+            if self.search_index is not None:
+                self.search_index.remove(task_id)
+            self.due_tracker.discard(task_id)
+            self.reminders.discard(task_id)
+        for task_id in changed:
+            task = self.store.get(task_id)
+            if self.search_index is not None:
+                self.search_index.update(task_id, task.text)
+            self.due_tracker.update(task)
+            self.reminders.update(task)
+        self.update_due_summary()
+        self.arm_reminders()
+
+        if self.search_query:
+            self.refresh_task_display()
+        else:
+            # The merge already re-filed the tasks; render() only reconfigures rows that differ
+            self.task_list.render()
+            self.update_empty_state()
 
     def setup_styles_and_theme(self):
         ctk.set_appearance_mode("Light")
@@ -160,30 +811,18 @@ class TodoApp(ctk.CTk):
         }
         
         self.colors = self.light_colors
+        self.theme = ThemeRegistry(self.colors)
         self.title_font = ("Inter", 24, "bold")
         self.body_font = ("Inter", 14)
         self.small_font = ("Inter", 10)
 
     def load_icons(self):
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(script_dir, "icons")
-        try:
-            self.icons = {
-                "logo": ctk.CTkImage(Image.open(os.path.join(icon_path, "logo.png")), size=(28, 28)),
-                "All": ctk.CTkImage(Image.open(os.path.join(icon_path, "home.png"))),
-                "Personal": ctk.CTkImage(Image.open(os.path.join(icon_path, "user.png"))),
-                "Work": ctk.CTkImage(Image.open(os.path.join(icon_path, "briefcase.png"))),
-                "Shopping": ctk.CTkImage(Image.open(os.path.join(icon_path, "shopping-cart.png"))),
-                "Health": ctk.CTkImage(Image.open(os.path.join(icon_path, "heart-pulse.png"))),
-                "Education": ctk.CTkImage(Image.open(os.path.join(icon_path, "book-marked.png"))),
-                "add": ctk.CTkImage(Image.open(os.path.join(icon_path, "plus.png"))),
-                "edit": ctk.CTkImage(Image.open(os.path.join(icon_path, "edit.png")), size=(16, 16)),
-                "delete": ctk.CTkImage(Image.open(os.path.join(icon_path, "delete.png")), size=(16, 16)),
-                "calendar": ctk.CTkImage(Image.open(os.path.join(icon_path, "calendar.png"))),
-                "no_tasks": ctk.CTkImage(Image.open(os.path.join(icon_path, "no-tasks.png")), size=(200, 200))
-            }
-        except FileNotFoundError as e:
-            messagebox.showerror("Icon Error", f"Could not find an icon file.\nPlease ensure the 'icons' folder exists and is in the same directory as the script.\n\nMissing file: {e.filename}")
+        self.icons = IconCache(os.path.join(script_dir, "icons"))
+        # Only stat the files here; decoding waits until an icon is first shown
+        missing = self.icons.missing_files()
+        if missing:
+            messagebox.showerror("Icon Error", f"Could not find an icon file.\nPlease ensure the 'icons' folder exists and is in the same directory as the script.\n\nMissing file: {missing[0]}")
             self.quit()
 
     def create_widgets(self):
@@ -197,6 +836,10 @@ class TodoApp(ctk.CTk):
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
 
+        self.theme.bind(self, fg_color='bg_primary')
+        self.theme.bind(self.sidebar_frame, fg_color='bg_secondary')
+        self.theme.bind(self.main_frame, fg_color='bg_primary')
+
         self.create_sidebar()
         self.create_main_content()
     
@@ -206,6 +849,7 @@ class TodoApp(ctk.CTk):
         ctk.CTkLabel(logo_frame, image=self.icons['logo'], text="").pack(side="left")
         self.logo_text = ctk.CTkLabel(logo_frame, text="TodoMaster", font=("Inter", 20, "bold"))
         self.logo_text.pack(side="left", padx=10)
+        self.theme.bind(self.logo_text, text_color='text_primary')
         
         self.category_buttons = {}
         for category in self.categories:
@@ -216,95 +860,66 @@ class TodoApp(ctk.CTk):
             )
             btn.pack(fill="x", padx=20, pady=5)
             self.category_buttons[category] = btn
+
+        self.due_summary_label = ctk.CTkLabel(self.sidebar_frame, text="", font=("Inter", 12), anchor="w")
+        self.due_summary_label.pack(fill="x", padx=30, pady=(15, 0))
         
         theme_frame = ctk.CTkFrame(self.sidebar_frame, fg_color="transparent")
         theme_frame.pack(side="bottom", fill="x", padx=20, pady=20)
         self.theme_label = ctk.CTkLabel(theme_frame, text="Light Mode", font=("Inter", 12))
         self.theme_label.pack(side="left")
+        self.theme.bind(self.theme_label, text_color='text_primary')
         self.theme_switch = ctk.CTkSwitch(theme_frame, text="", command=self.toggle_theme, width=0)
         self.theme_switch.pack(side="right")
         self.theme_switch.select()
 
     def create_main_content(self):
-        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_rowconfigure(2, weight=1)
         self.main_frame.grid_columnconfigure(0, weight=1)
 
         header_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         header_frame.grid(row=0, column=0, sticky="ew", pady=(0, 20))
         self.current_category_label = ctk.CTkLabel(header_frame, text="All Tasks", font=self.title_font)
         self.current_category_label.pack(side="left")
+        self.theme.bind(self.current_category_label, text_color='text_primary')
         
         add_task_btn = ctk.CTkButton(
             header_frame, text="Add New Task", command=self.show_add_task_dialog,
             image=self.icons['add'], font=("Inter", 14, "bold"), height=40,
         )
         add_task_btn.pack(side="right")
-        
-        self.task_list_frame = ctk.CTkScrollableFrame(self.main_frame, fg_color="transparent")
-        self.task_list_frame.grid(row=1, column=0, sticky="nsew")
 
-    def create_task_widget(self, task):
-        task_frame = ctk.CTkFrame(self.task_list_frame, fg_color=self.colors['bg_secondary'], border_width=1, border_color=self.colors['border'])
-        task_frame.pack(fill="x", pady=(0, 10), padx=5)
-
-        priority_colors = {'High': self.colors['danger'], 'Medium': self.colors['warning'], 'Low': self.colors['success']}
-        ctk.CTkFrame(task_frame, width=5, fg_color=priority_colors[task['priority']], corner_radius=0).pack(side="left", fill="y")
-        
-        content_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-        content_frame.pack(side="left", fill="x", expand=True, padx=15, pady=10)
-        
-        top_row = ctk.CTkFrame(content_frame, fg_color="transparent")
-        top_row.pack(fill="x")
-        
-        strike_font = ("Inter", 15, "overstrike") if task['completed'] else ("Inter", 15)
-        text_color = self.colors['text_secondary'] if task['completed'] else self.colors['text_primary']
+        export_btn = ctk.CTkButton(header_frame, text="Export", command=self.show_export_dialog, font=("Inter", 14), height=40, width=90)
+        export_btn.pack(side="right", padx=(0, 10))
+        import_btn = ctk.CTkButton(header_frame, text="Import", command=self.show_import_dialog, font=("Inter", 14), height=40, width=90)
+        import_btn.pack(side="right", padx=(0, 10))
         
-        checkbox = ctk.CTkCheckBox(
-            top_row, text="", variable=ctk.BooleanVar(value=task['completed']), 
-            command=lambda: self.toggle_task(task['id']),
-            onvalue=True, offvalue=False
-        )
-        checkbox.pack(side="left", padx=(0, 10))
-        
-        task_label = ctk.CTkLabel(top_row, text=task['text'], font=strike_font, text_color=text_color, anchor="w", wraplength=500)
-        task_label.pack(side="left", fill="x", expand=True)
+        filter_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        filter_frame.grid(row=1, column=0, sticky="ew", pady=(0, 15))
+        self.search_entry = ctk.CTkEntry(filter_frame, placeholder_text="Search tasks...", height=36, font=("Inter", 14))
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.search_entry.bind("<FocusIn>", lambda e: self.build_search_index())
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.status_buttons = ctk.CTkSegmentedButton(filter_frame, values=STATUS_FILTERS, command=self.set_status_filter, height=36)
+        self.status_buttons.set(self.status_filter)
+        self.status_buttons.pack(side="right")
 
-        bottom_row = ctk.CTkFrame(content_frame, fg_color="transparent")
-        bottom_row.pack(fill="x", pady=(8, 0))
+        self.task_list = VirtualTaskList(self.main_frame, row_factory=self.create_task_widget, fg_color="transparent")
+        self.task_list.grid(row=2, column=0, sticky="nsew")
+        self.theme.bind(self.task_list, fg_color='bg_primary')
+        self.empty_frame = None
 
-        if task.get('due_date'):
-            due_date = datetime.strptime(task['due_date'], "%Y-%m-%d").date()
-            days_left = (due_date - datetime.now().date()).days
-            
-            if days_left < 0:
-                due_text, due_color = f"Overdue by {abs(days_left)} days", self.colors['danger']
-            elif days_left == 0:
-                due_text, due_color = "Due Today", self.colors['warning']
-            else:
-                due_text, due_color = f"Due in {days_left} days", self.colors['text_secondary']
-                
-            ctk.CTkLabel(bottom_row, text=due_text, font=self.small_font, text_color=due_color).pack(side="left", padx=(34, 10))
+    def create_task_widget(self, parent):
+        return TaskRow(parent, self)
 
-        actions_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-        actions_frame.pack(side="right", padx=15)
-        
-        edit_btn = ctk.CTkButton(actions_frame, text="", image=self.icons['edit'], width=30, height=30, command=lambda t=task: self.show_edit_task_dialog(t))
-        edit_btn.pack(pady=(0,5))
-        
-        delete_btn = ctk.CTkButton(actions_frame, text="", image=self.icons['delete'], width=30, height=30, fg_color=self.colors['danger'], hover_color="#B33A3A", command=lambda t_id=task['id']: self.delete_task(t_id))
-        delete_btn.pack()
-
-    def apply_colors(self):
-        self.configure(fg_color=self.colors['bg_primary'])
-        self.sidebar_frame.configure(fg_color=self.colors['bg_secondary'])
-        self.main_frame.configure(fg_color=self.colors['bg_primary'])
-        self.task_list_frame.configure(fg_color=self.colors['bg_primary'])
-        
-        self.logo_text.configure(text_color=self.colors['text_primary'])
-        self.current_category_label.configure(text_color=self.colors['text_primary'])
-        self.theme_label.configure(text_color=self.colors['text_primary'])
-        
-        self.update_category_buttons()
+    def describe_due_date(self, task):
+        days_left = self.due_tracker.days_left(task)
+        # Returns the label and the color role it is drawn in
+        if days_left is not None and days_left < 0:
+            return due_label(days_left), 'danger'
+        elif days_left == 0:
+            return due_label(days_left), 'warning'
+        return due_label(days_left), 'text_secondary'
 
     def toggle_theme(self):
         if self.theme_switch.get() == 1:
@@ -316,57 +931,184 @@ class TodoApp(ctk.CTk):
             self.colors = self.dark_colors
             self.theme_label.configure(text="Dark Mode")
         
-        self.apply_colors()
-        self.refresh_task_display()
+        # Recolor the existing widgets in place; nothing is rebuilt or re-laid out
+        self.theme.apply(self.colors)
 
     def update_category_buttons(self):
         for category, btn in self.category_buttons.items():
             if category == self.current_category:
-                btn.configure(fg_color=self.colors['accent'], text_color=self.colors['bg_secondary'])
+                self.theme.bind(btn, fg_color='accent', text_color='bg_secondary')
             else:
-                btn.configure(fg_color="transparent", hover_color=self.colors['bg_tertiary'], text_color=self.colors['text_secondary'])
+                self.theme.bind(btn, fg_color="transparent", hover_color='bg_tertiary', text_color='text_secondary')
+
+    def update_due_summary(self):
+        counts = self.due_tracker.counts
+        if counts['overdue'] or counts['today']:
+            text = f"{counts['overdue']} overdue · {counts['today']} due today"
+        else:
+            text = "Nothing overdue"
+        self.due_summary_label.configure(text=text)
+        self.theme.bind(self.due_summary_label, text_color='danger' if counts['overdue'] else 'text_secondary')
 
     def show_add_task_dialog(self):
-        dialog = TaskDialog(self, title="Add New Task", icons=self.icons)
+        with self.profile("dialog open"):
+            dialog = TaskDialog(self, title="Add New Task", icons=self.icons)
         self.wait_window(dialog)
         
         if dialog.result:
-            new_task = {
-                'id': int(datetime.now().timestamp()),
-                'text': dialog.result['text'],
-                'completed': False,
-                'category': dialog.result['category'],
-                'priority': dialog.result['priority'],
-                'due_date': dialog.result['due_date'],
-                'created_at': datetime.now().isoformat(),
-                'completed_at': None
-            }
-            self.tasks.append(new_task)
-            self.refresh_task_display()
-            self.save_data()
+            with self.profile("dialog apply"):
+                new_task = create_task(self.store, **dialog.result)
+                self.store.add(new_task)
+                if self.search_index is not None:
+                    self.search_index.add(new_task.id, new_task.text)
+                self.track_due(new_task)
+                self.patch_task_display(new_task.id)
+                self.save_data(changed=[new_task])
 
     def show_edit_task_dialog(self, task):
-        dialog = TaskDialog(self, title="Edit Task", task_data=task, icons=self.icons)
+        with self.profile("dialog open"):
+            dialog = TaskDialog(self, title="Edit Task", task_data=task, icons=self.icons)
         self.wait_window(dialog)
         
-        if dialog.result:
-            task.update(dialog.result)
-            self.refresh_task_display()
-            self.save_data()
+        # Another window may have deleted the task while the dialog was open
+        if dialog.result and self.store.get(task.id) is not None:
+            with self.profile("dialog apply"):
+                task.update(dialog.result)
+                if self.search_index is not None:
+                    self.search_index.update(task.id, task.text)
+                self.track_due(task)
+                self.patch_task_display(task.id, moved=self.store.update(task))
+                self.save_data(changed=[task])
 
     def toggle_task(self, task_id):
-        task = next((t for t in self.tasks if t['id'] == task_id), None)
+        task = self.store.get(task_id)
         if task:
-            task['completed'] = not task['completed']
-            task['completed_at'] = datetime.now().isoformat() if task['completed'] else None
-            self.refresh_task_display()
-            self.save_data()
+            set_completed(task, not task.completed)
+            self.track_due(task)
+            self.patch_task_display(task_id, moved=self.store.update(task))
+            self.save_data(changed=[task])
 
     def delete_task(self, task_id):
         if messagebox.askyesno("Delete Task", "Are you sure you want to permanently delete this task?"):
-            self.tasks = [t for t in self.tasks if t['id'] != task_id]
+            self.store.remove(task_id)
+            if self.search_index is not None:
+                self.search_index.remove(task_id)
+            self.due_tracker.discard(task_id)
+            self.reminders.discard(task_id)
+            self.update_due_summary()
+            self.arm_reminders()
+            self.patch_task_display(task_id)
+            self.save_data(deleted=[task_id])
+
+    def show_import_dialog(self):
+        path = filedialog.askopenfilename(title="Import Tasks", filetypes=[("Task files", "*.jsonl *.csv"), ("JSON Lines", "*.jsonl"), ("CSV", "*.csv")])
+        if not path:
+            return
+
+        progress = ProgressDialog(self, "Importing Tasks")
+        rows = import_tasks(path, self.categories[1:])
+        total_bytes = max(os.path.getsize(path), 1)
+        errors = []  # only the first few messages are kept; a broken file can have millions
+        skipped = 0
+        stopped = None
+        imported = 0
+        self.importing = True
+
+        def note_error(message):
+            nonlocal skipped
+            skipped += 1
+            if len(errors) < IMPORT_ERRORS_SHOWN:
+                errors.append(message)
+
+        def import_batch():
+            nonlocal imported, stopped
+            batch = []
+            position = 0
+            try:
+                for position, line_number, task, error in itertools.islice(rows, IMPORT_BATCH_SIZE):
+                    if error:
+                        note_error(f"Line {line_number}: {error}")
+                        continue
+                    batch.append(task)
+            except Exception as e:
+                # Reading stopped (I/O, encoding or anything unexpected); keep the rows read so far
+                stopped = e
+                progress.cancelled = True
+
+            try:
+                if batch:
+                    first_id = self.store.new_ids(len(batch))
+                    for offset, task in enumerate(batch):
+                        task.id = first_id + offset
+                    self.store.add_many(batch)
+                    self.save_data(changed=batch)
+                    imported += len(batch)
+            except Exception as e:
+                # finish_import must still run, or the modal dialog and self.importing stay up
+                stopped = e
+                progress.cancelled = True
+
+            if position and not progress.cancelled:
+                progress.update_progress(position / total_bytes, f"Imported {imported:,} tasks")
+                self.after(1, import_batch)
+            else:
+                finish_import()
+
+        def finish_import():
+            rows.close()
+            self.importing = False
+            # The list is refreshed exactly once, after the last batch
+            self.store.reindex()
+            self.reset_search_index()
+            self.due_tracker = DueTracker(self.store.iter_due())
+            self.update_due_summary()
+            self.reload_reminders()
             self.refresh_task_display()
-            self.save_data()
+            progress.destroy()
+
+            summary = f"Imported {imported:,} tasks."
+            if skipped:
+                summary += f"\nSkipped {skipped:,} invalid rows:\n" + "\n".join(errors)
+            if stopped:
+                summary += f"\nImport stopped: {stopped}"
+            messagebox.showinfo("Import Complete", summary)
+
+        self.after(1, import_batch)
+
+    def show_export_dialog(self):
+        path = filedialog.asksaveasfilename(title="Export Tasks", defaultextension=".jsonl", filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")])
+        if not path:
+            return
+
+        progress = ProgressDialog(self, "Exporting Tasks")
+        total = max(len(self.store), 1)
+        chunks = export_tasks(iter(self.store), path)
+        self.exporting = True
+
+        def export_chunk():
+            try:
+                count = next(chunks, None)
+            except Exception as e:
+                # Whatever went wrong, the modal dialog has to go or the app stays locked
+                finish_export()
+                messagebox.showerror("Error", f"Failed to export tasks: {str(e)}")
+                return
+
+            if count is not None and not progress.cancelled:
+                progress.update_progress(count / total, f"Exported {count:,} tasks")
+                self.after(1, export_chunk)
+                return
+
+            finish_export()
+            if not progress.cancelled:
+                messagebox.showinfo("Export Complete", f"Exported {len(self.store):,} tasks to {os.path.basename(path)}.")
+
+        def finish_export():
+            chunks.close()
+            self.exporting = False
+            progress.destroy()
+
+        self.after(1, export_chunk)
 
     def set_category_filter(self, category):
         self.current_category = category
@@ -374,55 +1116,122 @@ class TodoApp(ctk.CTk):
         self.update_category_buttons()
         self.refresh_task_display()
 
+    def set_status_filter(self, status):
+        self.status_filter = status
+        self.refresh_task_display()
+
+    def track_due(self, task):
+        # Only the edited task is reclassified and its reminder re-queued; the sidebar reads the running counts
+        self.due_tracker.update(task)
+        self.reminders.update(task)
+        self.update_due_summary()
+        self.arm_reminders()
+
+    def reload_reminders(self):
+        # Keep what already fired so a reload does not repeat reminders
+        self.reminders = ReminderQueue(self.store.iter_due(), self.reminders.notified)
+        self.arm_reminders()
+
+    def build_search_index(self):
+        # Indexed a chunk per tick so focusing the search box never freezes the window. Changes made
+        # meanwhile go straight into the index and win over the snapshot being indexed.
+        if self.search_index is None:
+            self.search_index = SearchIndex()
+            self.search_build = self.search_index.build(list(self.store.iter_text()))
+            self.after(1, self.build_search_chunk, self.search_build)
+
+    def build_search_chunk(self, build):
+        if build is not self.search_build:
+            return  # the index was dropped (e.g. by a reload) since this build started
+        if next(build, None) is not None:
+            self.after(1, self.build_search_chunk, build)
+            return
+        self.search_build = None
+        if self.search_query:
+            self.refresh_task_display()
+
+    def reset_search_index(self):
+        self.search_index = None
+        self.search_build = None
+
+    def on_search_key(self, event):
+        # Debounce: only the last keystroke of a burst runs the query
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        self.search_job = None
+        query = self.search_entry.get().strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.refresh_task_display()
+
     def get_filtered_tasks(self):
-        filtered = self.tasks
-        if self.current_category != "All":
-            filtered = [t for t in filtered if t['category'] == self.current_category]
-        
-        priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
-        filtered.sort(key=lambda t: (
-            t['completed'],
-            t['due_date'] or '9999-12-31',
-            priority_order[t['priority']]
-        ))
-        return filtered
+        if not self.search_query:
+            return self.store.filter(self.current_category, self.status_filter)
+        self.build_search_index()
+        if self.search_build is not None:
+            return []  # refreshed again once the index is complete
+        return self.store.filter(self.current_category, self.status_filter, self.search_index.search(self.search_query))
 
-    def refresh_task_display(self):
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
+    def show_empty_state(self):
+        if self.empty_frame is None:
+            self.empty_frame = ctk.CTkFrame(self.task_list.viewport, fg_color="transparent")
+            ctk.CTkLabel(self.empty_frame, image=self.icons['no_tasks'], text="").pack()
+            self.no_task_label = ctk.CTkLabel(self.empty_frame, text="No tasks here!", font=("Inter", 18, "bold"))
+            self.no_task_label.pack(pady=(10, 5))
+            self.no_task_sublabel = ctk.CTkLabel(self.empty_frame, text="")
+            self.no_task_sublabel.pack()
+            self.theme.bind(self.no_task_label, text_color='text_primary')
+            self.theme.bind(self.no_task_sublabel, text_color='text_secondary')
 
-        filtered_tasks = self.get_filtered_tasks()
-        
-        if not filtered_tasks:
-            empty_frame = ctk.CTkFrame(self.task_list_frame, fg_color="transparent")
-            empty_frame.pack(expand=True, fill="both", pady=50)
-            ctk.CTkLabel(empty_frame, image=self.icons['no_tasks'], text="").pack()
-            no_task_label = ctk.CTkLabel(empty_frame, text="No tasks here!", font=("Inter", 18, "bold"), text_color=self.colors['text_primary'])
-            no_task_label.pack(pady=(10, 5))
-            no_task_sublabel = ctk.CTkLabel(empty_frame, text=f"Add a new task in the '{self.current_category}' category to get started.", text_color=self.colors['text_secondary'])
-            no_task_sublabel.pack()
+        if self.search_build is not None and self.search_query:
+            hint = "Indexing tasks for search..."
+        elif self.search_query:
+            hint = f"No tasks match '{self.search_query}'. Try a shorter or different search."
         else:
-            for task in filtered_tasks:
-                self.create_task_widget(task)
-        
+            hint = f"Add a new task in the '{self.current_category}' category to get started."
+        self.no_task_sublabel.configure(text=hint)
+        self.empty_frame.place(relx=0.5, y=50, anchor="n")
+
+    def update_empty_state(self):
+        if not self.task_list.items:
+            self.show_empty_state()
+        elif self.empty_frame is not None:
+            self.empty_frame.place_forget()
+
+    def patch_task_display(self, task_id, moved=True):
+        # Search results are a fixed list, so re-run the (indexed) query instead of patching
+        if self.search_query:
+            self.refresh_task_display()
+            return
+        # Otherwise the list already shows the live store bucket, so only the rows need reconciling
+        if moved:
+            self.task_list.render()
+        else:
+            self.task_list.refresh_row(task_id)
+        self.update_empty_state()
+
+    def refresh_task_display(self):
+        self.task_list.set_items(self.get_filtered_tasks())
+        self.update_empty_state()
         self.update_category_buttons()
 
-    def save_data(self):
-        try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.tasks, f, indent=4)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save data: {str(e)}")
+    def save_data(self, changed=(), deleted=()):
+        self.save_worker.submit(changed, deleted)
 
     def load_data(self):
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    self.tasks = json.load(f)
+            self.storage.load_into(self.store)
+            self.reset_search_index()
         except (json.JSONDecodeError, FileNotFoundError):
-            self.tasks = []
+            self.store.load([])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
+        self.due_tracker = DueTracker(self.store.iter_due())
+        self.update_due_summary()
+        self.reload_reminders()
         
         self.set_category_filter("All")
 
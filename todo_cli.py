@@ -0,0 +1,128 @@
+# Command-line interface for TodoMaster; works on the same todo_data.json as the app.
+#
+#   python todo_cli.py add "Renew passport" --category Personal --priority High --due 2025-07-01
+#   python todo_cli.py list --category Work --overdue
+#   python todo_cli.py complete 1718000000 1718000042
+#   python todo_cli.py purge-completed
+#   python todo_cli.py stats
+import argparse
+import sys
+from datetime import date, datetime
+
+from todo_core import (
+    CATEGORIES, PRIORITY_ORDER, STORAGE_BACKEND, create_task, days_until_due, due_label,
+    open_store, set_completed, task_stats
+)
+
+def format_task(task, today):
+    check = "x" if task.completed else " "
+    details = [task.category, task.priority]
+    if not task.completed and task.due is not None:
+        details.append(due_label(days_until_due(task, today)))
+    return f"{task.id:>12}  [{check}] {task.text}  ({', '.join(details)})"
+
+def cmd_add(args, store):
+    if args.due:
+        try:
+            datetime.strptime(args.due, "%Y-%m-%d")
+        except ValueError:
+            print("Invalid date format. Please use YYYY-MM-DD.", file=sys.stderr)
+            return 1, [], []
+
+    task = create_task(store, args.text, args.category, args.priority, args.due)
+    store.add(task)
+    print(f"Added task {task.id}")
+    return 0, [task], []
+
+def cmd_list(args, store):
+    today = date.today()
+    shown = 0
+    for task in store.query(args.category):
+        if args.overdue:
+            days_left = days_until_due(task, today)
+            if task.completed or days_left is None or days_left >= 0:
+                continue
+        print(format_task(task, today))
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+    return 0, [], []
+
+def cmd_complete(args, store):
+    changed, status = [], 0
+    for task_id in args.ids:
+        task = store.get(task_id)
+        if task is None:
+            print(f"No task with id {task_id}", file=sys.stderr)
+            status = 1
+            continue
+        if not task.completed:
+            set_completed(task, True)
+            store.update(task)
+            changed.append(task)
+    print(f"Completed {len(changed)} task(s)")
+    return status, changed, []
+
+def cmd_purge_completed(args, store):
+    deleted = [task.id for task in store if task.completed]
+    store.remove_many(deleted)
+    print(f"Removed {len(deleted)} completed task(s)")
+    return 0, [], deleted
+
+def cmd_stats(args, store):
+    stats = task_stats(store)
+    print(f"Total:     {stats['total']}")
+    print(f"Open:      {stats['open']}")
+    print(f"Completed: {stats['completed']}")
+    print(f"Overdue:   {stats['overdue']}")
+    print(f"Due today: {stats['due_today']}")
+    for category, count in stats['by_category'].items():
+        print(f"  {category:<12}{count}")
+    return 0, [], []
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="todo_cli.py", description="Manage TodoMaster tasks without starting the GUI.")
+    parser.add_argument("--data-file", default="todo_data.json", help="task file shared with the app (default: %(default)s)")
+    parser.add_argument("--storage", choices=["journal", "sqlite"], default=STORAGE_BACKEND, help="storage engine (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("text")
+    add.add_argument("--category", choices=CATEGORIES, default=CATEGORIES[0])
+    add.add_argument("--priority", choices=list(PRIORITY_ORDER), default="Medium")
+    add.add_argument("--due", help="due date as YYYY-MM-DD")
+    add.set_defaults(handler=cmd_add)
+
+    list_cmd = commands.add_parser("list", help="list tasks in display order")
+    list_cmd.add_argument("--category", choices=["All"] + CATEGORIES, default="All")
+    list_cmd.add_argument("--overdue", action="store_true", help="only open tasks past their due date")
+    list_cmd.add_argument("--limit", type=int, default=0, help="stop after this many tasks")
+    list_cmd.set_defaults(handler=cmd_list)
+
+    complete = commands.add_parser("complete", help="mark tasks as completed")
+    complete.add_argument("ids", type=int, nargs="+")
+    complete.set_defaults(handler=cmd_complete)
+
+    purge = commands.add_parser("purge-completed", help="delete every completed task")
+    purge.set_defaults(handler=cmd_purge_completed)
+
+    stats = commands.add_parser("stats", help="print task counts")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    store, storage = open_store(args.data_file, args.storage)
+    try:
+        storage.load_into(store)
+        status, changed, deleted = args.handler(args, store)
+        if changed or deleted:
+            storage.append(changed, deleted)
+            if storage.needs_compaction():
+                storage.compact(store)
+    finally:
+        storage.close()
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
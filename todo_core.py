@@ -0,0 +1,1395 @@
+# TodoMaster core: task storage, ordering, persistence and import/export.
+# Nothing in here imports customtkinter or PIL, so it runs on headless machines (see todo_cli.py).
+from datetime import date, datetime, timedelta
+import bisect
+import csv
+import heapq
+import itertools
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CATEGORIES = ["Personal", "Work", "Shopping", "Health", "Education"]
+
+# Fold the journal into a fresh snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# "journal" keeps every task in memory; "sqlite" pages tasks in from todo_data.db on demand
+STORAGE_BACKEND = os.environ.get("TODOMASTER_STORAGE", "journal")
+SQLITE_PAGE_SIZE = 200
+
+# Saves are coalesced over this window and written off the caller's thread
+SAVE_DEBOUNCE_SECONDS = 0.5
+# A failed write is kept and retried with the next batch, or on its own after this long
+SAVE_RETRY_SECONDS = 5
+
+# Reminders fire at this hour on the due date ("due today") and again a day later ("overdue")
+REMINDER_HOUR = 9
+
+# Streaming import/export: rows handled per batch, and the on-disk column order
+IMPORT_BATCH_SIZE = 1000
+TASK_FIELDS = ('id', 'text', 'completed', 'category', 'priority', 'due_date', 'created_at', 'completed_at', 'updated_at')
+
+# Search: tasks indexed per chunk while the index is built, and ids scanned per step for broad matches
+SEARCH_BUILD_CHUNK = 1000
+SEARCH_SCAN_CHUNK = 2000
+
+PRIORITY_ORDER = {'High': 0, 'Medium': 1, 'Low': 2}
+PRIORITY_NAMES = list(PRIORITY_ORDER)
+
+# Categories are stored on tasks as small ints; names found in old data files get a code too
+CATEGORY_NAMES = list(CATEGORIES)
+CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORY_NAMES)}
+
+# Task list filter by completion state; completed tasks always sort after open ones
+STATUS_FILTERS = ["All", "Active", "Completed"]
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+NO_DUE_DATE = date.max.toordinal()
+
+def category_code(name):
+    code = CATEGORY_CODES.get(name)
+    if code is None:
+        code = CATEGORY_CODES[name] = len(CATEGORY_NAMES)
+        CATEGORY_NAMES.append(name)
+    return code
+
+def parse_date(value):
+    # YYYY-MM-DD -> day ordinal; strptime also accepts unpadded dates like 2025-7-1
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+
+def parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+# --- Task model: dates parsed once at load time, category and priority kept as small ints ---
+class Task:
+    __slots__ = ('id', 'text', 'completed', 'category_code', 'priority_code', 'due', 'created_at', 'completed_at', 'updated_at')
+
+    def __init__(self, id, text, completed, category_code, priority_code, due, created_at, completed_at, updated_at=None):
+        self.id = id
+        self.text = text
+        self.completed = completed
+        self.category_code = category_code
+        self.priority_code = priority_code
+        self.due = due  # day ordinal or None
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.updated_at = updated_at  # last-modified stamp that decides concurrent edits from other instances
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get('id'),
+            data['text'],
+            bool(data.get('completed')),
+            category_code(data['category']),
+            PRIORITY_ORDER[data['priority']],
+            parse_date(data.get('due_date')),
+            parse_datetime(data.get('created_at')),
+            parse_datetime(data.get('completed_at')),
+            parse_datetime(data.get('updated_at'))
+        )
+
+    def to_dict(self):
+        # Same layout as the JSON file, in TASK_FIELDS order
+        return {
+            'id': self.id,
+            'text': self.text,
+            'completed': self.completed,
+            'category': self.category,
+            'priority': self.priority,
+            'due_date': self.due_date,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def copy(self):
+        return Task(self.id, self.text, self.completed, self.category_code, self.priority_code,
+                    self.due, self.created_at, self.completed_at, self.updated_at)
+
+    def copy_from(self, other):
+        # Take over another version of this task in place, so rows and open dialogs keep their object
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def update(self, fields):
+        # Apply dialog results such as {'text': ..., 'category': ..., 'due_date': ...}
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.updated_at = datetime.now()
+
+    def modified_at(self):
+        return self.updated_at or self.created_at or datetime.min
+
+    @property
+    def category(self):
+        return CATEGORY_NAMES[self.category_code]
+
+    @category.setter
+    def category(self, name):
+        self.category_code = category_code(name)
+
+    @property
+    def priority(self):
+        return PRIORITY_NAMES[self.priority_code]
+
+    @priority.setter
+    def priority(self, name):
+        self.priority_code = PRIORITY_ORDER[name]
+
+    @property
+    def due_date(self):
+        return date.fromordinal(self.due).isoformat() if self.due is not None else None
+
+    @due_date.setter
+    def due_date(self, value):
+        self.due = parse_date(value)
+
+    def __repr__(self):
+        return f"Task({self.to_dict()!r})"
+
+def task_sort_key(task):
+    # The id breaks ties so every task has a unique, bisectable position
+    return (
+        task.completed,
+        NO_DUE_DATE if task.due is None else task.due,
+        task.priority_code,
+        task.id
+    )
+
+# --- Task helpers shared by the GUI and the CLI ---
+def create_task(store, text, category, priority, due_date=None):
+    now = datetime.now()
+    return Task(store.new_id(), text, False, category_code(category), PRIORITY_ORDER[priority],
+                parse_date(due_date), now, None, now)
+
+def set_completed(task, completed):
+    now = datetime.now()
+    task.completed = completed
+    task.completed_at = now if completed else None
+    task.updated_at = now
+
+def days_until_due(task, today=None):
+    if task.due is None:
+        return None
+    return task.due - (today or date.today()).toordinal()
+
+def due_label(days_left):
+    if days_left is None:
+        return ""
+    if days_left < 0:
+        return f"Overdue by {abs(days_left)} days"
+    if days_left == 0:
+        return "Due Today"
+    return f"Due in {days_left} days"
+
+def task_stats(store, today=None):
+    today = today or date.today()
+    stats = {'total': 0, 'completed': 0, 'open': 0, 'overdue': 0, 'due_today': 0}
+    stats['by_category'] = {category: 0 for category in CATEGORIES}
+    for task in store:
+        stats['total'] += 1
+        stats['by_category'][task.category] = stats['by_category'].get(task.category, 0) + 1
+        if task.completed:
+            stats['completed'] += 1
+            continue
+        stats['open'] += 1
+    due = DueTracker(store.iter_due(), today)
+    stats['overdue'] = due.counts['overdue']
+    stats['due_today'] = due.counts['today']
+    return stats
+
+def open_store(data_file, backend=STORAGE_BACKEND):
+    # Returns (store, storage); the SQLite store persists itself, so it is both
+    if backend == "sqlite":
+        store = SQLiteTaskStore(os.path.splitext(data_file)[0] + ".db", migrate_from=data_file)
+        return store, store
+    store, storage = TaskStore(), JournalStorage(data_file)
+    store.id_source = storage.ids.reserve
+    return store, storage
+
+# --- Streaming import/export (JSON Lines and CSV) ---
+def read_lines(path):
+    # Yield (bytes read so far, decoded line) so callers can report progress while streaming
+    position = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            position += len(line)
+            yield position, line.decode('utf-8').lstrip('\ufeff')
+
+def iter_records(path):
+    # Yield (bytes read, line number, record); record is None for a line that is not valid JSON
+    if path.lower().endswith('.csv'):
+        position = 0
+        def text_lines():
+            nonlocal position
+            for position, line in read_lines(path):
+                yield line
+        reader = csv.DictReader(text_lines())
+        for record in reader:
+            yield position, reader.line_num, record
+    else:
+        for line_number, (position, line) in enumerate(read_lines(path), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield position, line_number, record
+
+def parse_bool(value, default):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in ('true', '1', 'yes'):
+        return True
+    if str(value).strip().lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(f"invalid completed flag {value!r}")
+
+def parse_timestamp(value, field):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid {field} {value!r}")
+
+def validate_task(record, categories):
+    # Normalize one imported record to the schema built by show_add_task_dialog
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+
+    text = str(record.get('text') or '').strip()
+    if not text:
+        raise ValueError("task description cannot be empty")
+    category = record.get('category')
+    if not isinstance(category, str) or category not in categories:
+        raise ValueError(f"unknown category {category!r}")
+    priority = record.get('priority') or 'Medium'
+    if not isinstance(priority, str) or priority not in PRIORITY_ORDER:
+        raise ValueError(f"unknown priority {priority!r}")
+
+    due_date = record.get('due_date') or None
+    try:
+        due = parse_date(due_date)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid due_date {due_date!r}, expected YYYY-MM-DD")
+
+    completed_at = parse_timestamp(record.get('completed_at'), 'completed_at')
+    return Task(
+        None,
+        text,
+        parse_bool(record.get('completed'), default=completed_at is not None),
+        category_code(category),
+        PRIORITY_ORDER[priority],
+        due,
+        parse_timestamp(record.get('created_at'), 'created_at') or datetime.now(),
+        completed_at,
+        datetime.now()
+    )
+
+def import_tasks(path, categories):
+    # Yield (bytes read, line number, task, error); exactly one of task/error is set
+    for position, line_number, record in iter_records(path):
+        try:
+            if record is None:
+                raise ValueError("not valid JSON")
+            yield position, line_number, validate_task(record, categories), None
+        except (TypeError, ValueError) as e:  # TypeError: odd JSON types slipping past the checks
+            yield position, line_number, None, str(e)
+
+def export_tasks(tasks, path, chunk_size=IMPORT_BATCH_SIZE):
+    # Write tasks row by row and yield the running count after every chunk. The file is written
+    # under a temporary name and only renamed into place once every row is out.
+    temp_file = path + ".tmp"
+    finished = False
+    try:
+        with open(temp_file, 'w', newline='', encoding='utf-8') as f:
+            if path.lower().endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=TASK_FIELDS)
+                writer.writeheader()
+                write_row = lambda task: writer.writerow(task.to_dict())
+            else:
+                write_row = lambda task: f.write(json.dumps(task.to_dict()) + "\n")
+
+            count = 0
+            for task in tasks:
+                write_row(task)
+                count += 1
+                if count % chunk_size == 0:
+                    yield count
+        os.replace(temp_file, path)
+        finished = True
+        yield count
+    finally:
+        if not finished and os.path.exists(temp_file):
+            os.remove(temp_file)
+
+# --- A list of tasks kept ordered by task_sort_key with bisect ---
+class SortedTaskList:
+    def __init__(self):
+        self.keys = []
+        self.tasks = []
+        self.ids = []  # kept alongside so id filters don't have to touch every task dict
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __getitem__(self, index):
+        return self.tasks[index]
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def bounds(self):
+        return 0, len(self.tasks)
+
+    def insert(self, key, task):
+        index = bisect.bisect_left(self.keys, key)
+        self.keys.insert(index, key)
+        self.tasks.insert(index, task)
+        self.ids.insert(index, task.id)
+
+    def remove(self, key):
+        index = bisect.bisect_left(self.keys, key)
+        del self.keys[index]
+        del self.tasks[index]
+        del self.ids[index]
+
+# --- The open or the completed part of a SortedTaskList, found by bisecting on the completed flag ---
+class StatusView:
+    def __init__(self, tasks, completed):
+        self.tasks = tasks
+        self.completed = completed
+
+    def bounds(self):
+        split = bisect.bisect_left(self.tasks.keys, (True,))
+        return (split, len(self.tasks)) if self.completed else (0, split)
+
+    def __len__(self):
+        start, end = self.bounds()
+        return end - start
+
+    def __getitem__(self, index):
+        start, end = self.bounds()
+        if not 0 <= index < end - start:
+            raise IndexError(index)
+        return self.tasks[start + index]
+
+    def __iter__(self):
+        start, end = self.bounds()
+        return iter(self.tasks.tasks[start:end])
+
+# --- Search matches inside an ordered view, collected a chunk at a time as rows are read ---
+class SearchView:
+    def __init__(self, bucket, start, end, task_ids, count):
+        self.bucket = bucket
+        self.task_ids = task_ids
+        self.position, self.end = start, end
+        self.count = count
+        self.matches = []
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        while len(self.matches) <= index and self.position < self.end:
+            stop = min(self.position + SEARCH_SCAN_CHUNK, self.end)
+            ids = self.bucket.ids[self.position:stop]
+            self.matches.extend(itertools.compress(self.bucket.tasks[self.position:stop], map(self.task_ids.__contains__, ids)))
+            self.position = stop
+        return self.matches[index]
+
+    def __iter__(self):
+        return (self[index] for index in range(self.count))
+
+# --- Indexed in-memory task store: id index, per-category buckets, incremental sort order ---
+class TaskStore:
+    def __init__(self):
+        self.last_id = 0
+        self.id_source = None  # set by open_store so instances sharing a data file never collide
+        self.load([])
+
+    def load(self, tasks):
+        self.by_id = {}
+        self.indexed = {}  # id -> (sort key, category) the task is currently filed under
+        self.all = SortedTaskList()
+        self.buckets = {}
+        self.last_id = max([self.last_id] + [task.id for task in tasks])
+        self.renumbered = []  # tasks whose id clashed and was replaced; the caller persists them
+
+        for task in tasks:
+            if task.id in self.by_id:
+                # Older builds could hand out the same id twice within one second
+                task.id = self.new_id()
+                self.renumbered.append(task)
+            self.by_id[task.id] = task
+
+        # Sort once for the bulk load instead of bisecting every task in
+        for task in sorted(self.by_id.values(), key=task_sort_key):
+            key = task_sort_key(task)
+            self.indexed[task.id] = (key, task.category)
+            for bucket in (self.all, self.query(task.category)):
+                bucket.keys.append(key)
+                bucket.tasks.append(task)
+                bucket.ids.append(task.id)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def new_ids(self, count=1):
+        # First of `count` consecutive ids, all past every id this store has seen
+        start = max(int(datetime.now().timestamp()), self.last_id + 1)
+        if self.id_source is not None:
+            start = self.id_source(count, start)
+        self.last_id = start + count - 1
+        return start
+
+    def new_id(self):
+        return self.new_ids()
+
+    def get(self, task_id):
+        return self.by_id.get(task_id)
+
+    def query(self, category):
+        if category == "All":
+            return self.all
+        return self.buckets.setdefault(category, SortedTaskList())
+
+    def filter(self, category, status="All", task_ids=None):
+        bucket = self.query(category)
+        view = bucket if status == "All" else StatusView(bucket, status == "Completed")
+        if task_ids is None:
+            return view
+
+        # Search results: sort a handful of matches directly, otherwise page through the ordered view
+        if len(task_ids) * 64 < len(view):
+            matches = []
+            for task_id in task_ids:
+                key, task_category = self.indexed[task_id]
+                if category in ("All", task_category) and status in ("All", "Completed" if key[0] else "Active"):
+                    matches.append((key, task_id))
+            return [self.by_id[task_id] for key, task_id in sorted(matches)]
+
+        # Only the count needs a full pass. Every search hit is in `all`, so there it is enough to
+        # count whichever side of the view is shorter.
+        start, end = view.bounds()
+        contains = task_ids.__contains__
+        if bucket is self.all and end - start > len(bucket) // 2:
+            count = len(task_ids) - sum(map(contains, bucket.ids[:start])) - sum(map(contains, bucket.ids[end:]))
+        else:
+            count = sum(map(contains, bucket.ids[start:end]))
+        return SearchView(bucket, start, end, task_ids, count)
+
+    def iter_text(self):
+        return ((task.id, task.text) for task in self.by_id.values())
+
+    def iter_due(self):
+        return ((task.id, task.due) for task in self.by_id.values() if not task.completed and task.due is not None)
+
+    def add(self, task):
+        self.by_id[task.id] = task
+        self.last_id = max(self.last_id, task.id)
+        self.file(task)
+
+    def add_many(self, tasks):
+        # Bulk path for imports: index by id now and file into the sorted buckets once, in reindex()
+        for task in tasks:
+            self.by_id[task.id] = task
+            self.last_id = max(self.last_id, task.id)
+
+    def remove_many(self, task_ids):
+        for task_id in task_ids:
+            self.by_id.pop(task_id, None)
+        self.reindex()
+
+    def reindex(self):
+        self.load(list(self.by_id.values()))
+
+    def update(self, task):
+        # Re-file a task after it was mutated; returns True if its position changed
+        if self.indexed[task.id] == (task_sort_key(task), task.category):
+            return False
+        self.unfile(task.id)
+        self.file(task)
+        return True
+
+    def remove(self, task_id):
+        task = self.by_id.pop(task_id, None)
+        if task is not None:
+            self.unfile(task_id)
+        return task
+
+    def file(self, task):
+        key = task_sort_key(task)
+        self.indexed[task.id] = (key, task.category)
+        self.all.insert(key, task)
+        self.query(task.category).insert(key, task)
+
+    def unfile(self, task_id):
+        key, category = self.indexed.pop(task_id)
+        self.all.remove(key)
+        self.query(category).remove(key)
+
+# --- Advisory lock on a file shared by every instance; also serializes threads in this one ---
+def lock_file(f, blocking=True):
+    # Returns False instead of waiting when blocking is off and another process holds the lock
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+def unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def file_state(path):
+    # (inode, mtime, size) for change polling, or None if the file does not exist
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+    def acquire(self, blocking=True):
+        if not self.thread_lock.acquire(blocking):
+            return False
+        if self.depth == 0:
+            if self.file is None:
+                self.file = open(self.path, 'a+b')
+            if not lock_file(self.file, blocking):
+                self.thread_lock.release()
+                return False
+        self.depth += 1
+        return True
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            unlock_file(self.file)
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def close(self):
+        with self.thread_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+# --- Next free task id, kept in a file so instances sharing the data never hand out the same id ---
+class IdCounter:
+    def __init__(self, path):
+        self.lock = FileLock(path)  # the counter file doubles as its own lock file
+
+    def reserve(self, count, at_least):
+        # First of `count` consecutive ids, all >= at_least and never reserved before
+        with self.lock:
+            f = self.lock.file
+            f.seek(0)
+            try:
+                next_id = int(f.read() or 0)
+            except ValueError:
+                next_id = 0
+            start = max(next_id, at_least)
+            f.seek(0)
+            f.truncate()
+            f.write(str(start + count).encode())
+            f.flush()
+        return start
+
+    def close(self):
+        self.lock.close()
+
+# --- Append-only journal persistence on top of the JSON snapshot ---
+class JournalStorage:
+    def __init__(self, snapshot_file):
+        self.snapshot_file = snapshot_file
+        self.journal_file = snapshot_file + ".journal"
+        self.rotated_file = self.journal_file + ".old"
+        self.compactor = None
+        self.compaction_error = None
+        # Held by whoever touches the files: our save worker, our Tk thread, and other instances
+        self.lock = FileLock(snapshot_file + ".lock")
+        self.ids = IdCounter(snapshot_file + ".ids")
+        self.tombstones = {}  # id -> when it was deleted, so an older put read later cannot bring it back
+        self.snapshot_state = None  # file_state of the snapshot as we last read or wrote it
+        self.journal_inode = None  # the journal we have read up to journal_offset
+        self.journal_offset = 0
+
+    def load_into(self, store):
+        with self.lock:
+            tasks = []
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r') as f:
+                    tasks = [Task.from_dict(data) for data in json.load(f)]
+            store.load(tasks)
+            self.snapshot_state = file_state(self.snapshot_file)
+            self.tombstones = {}
+            self.journal_inode, self.journal_offset = None, 0
+
+            # A rotated journal is only left behind by older builds that died mid-compaction; replay it first
+            for record in self.read_journal(self.rotated_file)[0]:
+                self.replay(store, record)
+            for record in self.read_new_records():
+                self.replay(store, record)
+
+            if store.renumbered:
+                # Write the new ids back at once; kept in memory only they would change on every load
+                self.write_snapshot(list(store), file_state(self.journal_file))
+
+    def read_journal(self, path, offset=0):
+        # Complete records from offset on, and the offset just past the last of them
+        if not os.path.exists(path):
+            return [], offset
+
+        records, valid_bytes = [], offset
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                valid_bytes += len(line)
+            torn = f.tell() > valid_bytes
+
+        if torn:
+            # Drop a record torn by a crash mid-append so new records start on a clean line
+            with open(path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return records, valid_bytes
+
+    def read_new_records(self):
+        state = file_state(self.journal_file)
+        if state is None:
+            return []
+        if state[0] != self.journal_inode:
+            self.journal_inode, self.journal_offset = state[0], 0
+        records, self.journal_offset = self.read_journal(self.journal_file, self.journal_offset)
+        return records
+
+    def replay(self, store, record):
+        # Merge one record; per task the newest updated_at wins. Returns True if the store changed.
+        if 'put' in record:
+            task = Task.from_dict(record['put'])
+            if task.id in self.tombstones and self.tombstones[task.id] >= task.modified_at():
+                return False
+            existing = store.get(task.id)
+            if existing is None:
+                store.add(task)
+            elif task.modified_at() >= existing.modified_at():
+                existing.copy_from(task)
+                store.update(existing)
+            else:
+                return False
+            return True
+
+        task_id = record['del']
+        deleted_at = parse_datetime(record.get('at')) or datetime.max  # older builds wrote no stamp
+        self.tombstones[task_id] = deleted_at
+        existing = store.get(task_id)
+        if existing is None or existing.modified_at() > deleted_at:
+            return False
+        store.remove(task_id)
+        return True
+
+    def changed_on_disk(self):
+        journal = file_state(self.journal_file)
+        journal_position = (journal[0], journal[2]) if journal else (None, 0)
+        return file_state(self.snapshot_file) != self.snapshot_state or journal_position != (self.journal_inode, self.journal_offset)
+
+    def poll(self, store):
+        # Merge what other instances wrote since we last looked. Only call this once every local
+        # change has been appended. Returns None if nothing changed on disk, else the ids of tasks
+        # that changed and of tasks that were deleted.
+        if not self.changed_on_disk():
+            return None
+        if not self.lock.acquire(blocking=False):
+            return None  # another instance is writing; look again next time
+        try:
+            if file_state(self.snapshot_file) != self.snapshot_state:
+                return self.reload_into(store)
+
+            changed, deleted = set(), set()
+            for record in self.read_new_records():
+                if self.replay(store, record):
+                    if 'put' in record:
+                        changed.add(record['put']['id'])
+                    else:
+                        changed.discard(record['del'])
+                        deleted.add(record['del'])
+            return list(changed), list(deleted)
+        finally:
+            self.lock.release()
+
+    def reload_into(self, store):
+        # Another instance compacted; read the new snapshot and merge it into the live tasks in place
+        fresh = TaskStore()
+        fresh.last_id, fresh.id_source = store.last_id, store.id_source
+        self.load_into(fresh)
+        changed, deleted = [], []
+        for task in fresh:
+            existing = store.get(task.id)
+            if existing is None:
+                store.add(task)
+            elif task.modified_at() > existing.modified_at():
+                existing.copy_from(task)
+                store.update(existing)
+            else:
+                continue
+            changed.append(task.id)
+        for task in list(store):
+            if fresh.get(task.id) is None:
+                store.remove(task.id)
+                deleted.append(task.id)
+        return changed, deleted
+
+    def append(self, changed=(), deleted=()):
+        deleted_at = datetime.now().isoformat()
+        records = [{'put': task.to_dict()} for task in changed] + [{'del': task_id, 'at': deleted_at} for task_id in deleted]
+        data = b"".join(json.dumps(r, separators=(',', ':')).encode() + b"\n" for r in records)
+        with self.lock:
+            # Opened per append and closed before the lock is released: on Windows, a handle that any
+            # instance keeps open stops compaction from deleting the journal
+            with open(self.journal_file, 'ab') as journal:
+                state = os.fstat(journal.fileno())
+                inode, size = state.st_ino, state.st_size
+                journal.write(data)
+            if self.journal_inode in (None, inode) and self.journal_offset == size:
+                # Nobody else wrote since our last read, so there is no need to read our own records back
+                self.journal_inode, self.journal_offset = inode, size + len(data)
+
+    def needs_compaction(self):
+        state = file_state(self.journal_file)
+        return state is not None and state[2] > JOURNAL_COMPACT_BYTES
+
+    def take_compaction_error(self):
+        # The last background compaction failure, reported once; the journal still holds every record
+        error, self.compaction_error = self.compaction_error, None
+        return error
+
+    def compact(self, tasks):
+        # Fold the journal into a fresh snapshot in the background. Skipped (the save worker asks again
+        # later) while other instances hold the lock or have written records we have not merged yet.
+        if self.compactor is not None and self.compactor.is_alive():
+            return
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            if self.changed_on_disk() or not os.path.exists(self.journal_file):
+                return
+            expected = file_state(self.journal_file)
+            # Copy the tasks because the Tk thread keeps mutating them
+            snapshot = [task.copy() for task in tasks]
+        finally:
+            self.lock.release()
+        self.compactor = threading.Thread(target=self.compact_in_background, args=(snapshot, expected), daemon=True)
+        self.compactor.start()
+
+    def compact_in_background(self, tasks, expected):
+        try:
+            self.write_snapshot(tasks, expected)
+        except Exception as e:
+            self.compaction_error = e
+
+    def write_snapshot(self, tasks, expected=None):
+        # With `expected` (the journal's file_state when the tasks were copied) the journal is folded in and removed
+        with self.lock:
+            # Anything appended since the copy is not in it; leave the journal for the next round
+            state = file_state(self.journal_file)
+            if expected is not None and (state is None or (state[0], state[2]) != (expected[0], expected[2])):
+                return
+            temp_file = self.snapshot_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump([task.to_dict() for task in tasks], f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.snapshot_file)
+            self.snapshot_state = file_state(self.snapshot_file)
+            if expected is not None:
+                os.remove(self.journal_file)
+                if os.path.exists(self.rotated_file):
+                    os.remove(self.rotated_file)
+                self.journal_inode, self.journal_offset = None, 0
+
+    def close(self):
+        if self.compactor is not None:
+            self.compactor.join()
+        self.lock.close()
+        self.ids.close()
+
+# --- SQLite task store: same API as TaskStore, but rows are paged in with indexed queries ---
+class SQLiteTaskStore:
+    COLUMNS = ('id', 'text', 'completed', 'category', 'priority', 'due_date', 'created_at', 'completed_at', 'updated_at')
+    TABLE_COLUMNS = ('id', 'text', 'completed', 'category', 'priority', 'priority_rank', 'due_date', 'created_at', 'completed_at', 'updated_at')
+    ORDER_BY = "completed, COALESCE(due_date, '9999-12-31'), priority_rank, id"
+
+    def __init__(self, db_file, migrate_from=None):
+        self.db_file = db_file
+        self.migrate_from = migrate_from
+        self.views = {}
+        self.ids = IdCounter(db_file + ".ids")
+        self.id_source = self.ids.reserve
+        # The save worker commits on this connection while the Tk thread runs statements
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL,
+                completed INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                priority_rank INTEGER NOT NULL,
+                due_date TEXT,
+                created_at TEXT,
+                completed_at TEXT,
+                updated_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tasks_order ON tasks({self.ORDER_BY});
+            CREATE INDEX IF NOT EXISTS tasks_category_order ON tasks(category, {self.ORDER_BY});
+        """)
+        if 'updated_at' not in [row[1] for row in self.db.execute("PRAGMA table_info(tasks)")]:
+            # Databases created before tasks carried a last-modified stamp
+            self.db.execute("ALTER TABLE tasks ADD COLUMN updated_at TEXT")
+            self.db.commit()
+        self.data_version = self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def load_into(self, store):
+        # One-shot migration the first time the database is opened next to an existing JSON file
+        if self.db.execute("PRAGMA user_version").fetchone()[0] == 0:
+            if self.migrate_from:
+                json_store, json_storage = TaskStore(), JournalStorage(self.migrate_from)
+                json_storage.load_into(json_store)
+                json_storage.close()
+                self.load(list(json_store))
+            self.db.execute("PRAGMA user_version = 1")
+            self.db.commit()
+
+    def load(self, tasks):
+        with self.lock:
+            self.db.execute("DELETE FROM tasks")
+            self.db.executemany(self.insert_sql(), (self.to_row(task) for task in tasks))
+            self.db.commit()
+        self.invalidate()
+
+    def insert_sql(self):
+        # Upsert that keeps a row another instance changed more recently
+        placeholders = ", ".join("?" * len(self.TABLE_COLUMNS))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.TABLE_COLUMNS[1:])
+        return (
+            f"INSERT INTO tasks VALUES ({placeholders}) ON CONFLICT(id) DO UPDATE SET {updates} "
+            "WHERE excluded.updated_at IS NULL OR tasks.updated_at IS NULL OR excluded.updated_at >= tasks.updated_at"
+        )
+
+    def to_row(self, task):
+        return (
+            task.id, task.text, int(task.completed), task.category, task.priority,
+            task.priority_code, task.due_date,
+            task.created_at.isoformat() if task.created_at else None,
+            task.completed_at.isoformat() if task.completed_at else None,
+            task.updated_at.isoformat() if task.updated_at else None
+        )
+
+    def to_task(self, row):
+        return Task.from_dict(dict(zip(self.COLUMNS, row)))
+
+    def select(self, where="", params=(), suffix=""):
+        columns = ", ".join(self.COLUMNS)
+        return self.db.execute(f"SELECT {columns} FROM tasks {where} {suffix}", params)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def __iter__(self):
+        return (self.to_task(row) for row in self.select())
+
+    def new_ids(self, count=1):
+        last_id = self.db.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0
+        return self.id_source(count, max(int(datetime.now().timestamp()), last_id + 1))
+
+    def new_id(self):
+        return self.new_ids()
+
+    def get(self, task_id):
+        row = self.select("WHERE id = ?", (task_id,)).fetchone()
+        return self.to_task(row) if row else None
+
+    def query(self, category):
+        return self.filter(category)
+
+    def filter(self, category, status="All", task_ids=None):
+        conditions, params = [], []
+        if category != "All":
+            conditions.append("category = ?")
+            params.append(category)
+        if status != "All":
+            conditions.append("completed = ?")
+            params.append(int(status == "Completed"))
+
+        if task_ids is None:
+            if (category, status) not in self.views:
+                self.views[(category, status)] = PagedQuery(self, " AND ".join(conditions), params)
+            return self.views[(category, status)]
+
+        # Search results are joined through a temp table; only one search is live at a time
+        with self.lock:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS search_ids (id INTEGER PRIMARY KEY)")
+            self.db.execute("DELETE FROM search_ids")
+            self.db.executemany("INSERT INTO search_ids VALUES (?)", ((task_id,) for task_id in task_ids))
+        conditions.append("id IN (SELECT id FROM search_ids)")
+        self.views['search'] = PagedQuery(self, " AND ".join(conditions), params)
+        return self.views['search']
+
+    def fetch(self, condition, params, limit, offset):
+        where = f"WHERE {condition}" if condition else ""
+        cursor = self.select(where, (*params, limit, offset), f"ORDER BY {self.ORDER_BY} LIMIT ? OFFSET ?")
+        return [self.to_task(row) for row in cursor]
+
+    def count(self, condition, params):
+        where = f"WHERE {condition}" if condition else ""
+        return self.db.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+    def iter_text(self):
+        return self.db.execute("SELECT id, text FROM tasks")
+
+    def iter_due(self):
+        rows = self.db.execute("SELECT id, due_date FROM tasks WHERE completed = 0 AND due_date IS NOT NULL")
+        return ((task_id, parse_date(due_date)) for task_id, due_date in rows)
+
+    def add(self, task):
+        with self.lock:
+            self.db.execute(self.insert_sql(), self.to_row(task))
+        self.invalidate()
+
+    def add_many(self, tasks):
+        with self.lock:
+            self.db.executemany(self.insert_sql(), (self.to_row(task) for task in tasks))
+
+    def remove_many(self, task_ids):
+        with self.lock:
+            self.db.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in task_ids))
+        self.invalidate()
+
+    def reindex(self):
+        self.invalidate()
+
+    def update(self, task):
+        with self.lock:
+            self.db.execute(self.insert_sql(), self.to_row(task))
+        self.invalidate()
+        return True
+
+    def remove(self, task_id):
+        task = self.get(task_id)
+        with self.lock:
+            self.db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self.invalidate()
+        return task
+
+    def invalidate(self):
+        for view in self.views.values():
+            view.invalidate()
+
+    # Storage surface shared with JournalStorage: statements already ran, so saving is a commit
+    def append(self, changed=(), deleted=()):
+        with self.lock:
+            self.db.commit()
+
+    def needs_compaction(self):
+        return False
+
+    def take_compaction_error(self):
+        return None
+
+    def poll(self, store):
+        # data_version moves when another connection commits; which rows changed is not known,
+        # so the cached pages are dropped and (None, None) tells the caller to re-read everything
+        version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.data_version:
+            return None
+        self.data_version = version
+        self.invalidate()
+        return None, None
+
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+        self.ids.close()
+
+# --- Read-only sequence over one filtered view, fetched from SQLite a page at a time ---
+class PagedQuery:
+    def __init__(self, store, condition, params):
+        self.store = store
+        self.condition = condition
+        self.params = params
+        self.invalidate()
+
+    def invalidate(self):
+        self.pages = {}
+        self.length = None
+
+    def __len__(self):
+        if self.length is None:
+            self.length = self.store.count(self.condition, self.params)
+        return self.length
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        page, offset = divmod(index, SQLITE_PAGE_SIZE)
+        if page not in self.pages:
+            self.pages[page] = self.store.fetch(self.condition, self.params, SQLITE_PAGE_SIZE, page * SQLITE_PAGE_SIZE)
+        return self.pages[page][offset]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+# --- Inverted token index over task text; every query term matches as a word prefix ---
+def tokenize(text):
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+class SearchIndex:
+    def __init__(self, entries=()):
+        self.postings = {}   # token -> ids of tasks containing it
+        self.tokens_of = {}  # id -> tokens indexed for that task
+        self.vocabulary = []  # sorted; bisected for prefix ranges
+        self.changed = None  # while build() runs: ids add/update/remove already set from fresher text
+        for _ in self.build(entries):
+            pass
+
+    def build(self, entries, chunk_size=SEARCH_BUILD_CHUNK):
+        # Index (id, text) pairs a chunk at a time through the returned generator, which yields the
+        # running count in between so a UI can stay responsive. The index can be kept in step with
+        # add/update/remove from the moment this returns.
+        self.changed = set()
+        return self.build_chunks(iter(entries), chunk_size)
+
+    def build_chunks(self, entries, chunk_size):
+        count = 0
+        try:
+            while True:
+                chunk = list(itertools.islice(entries, chunk_size))
+                if not chunk:
+                    return
+                new_tokens = []
+                for task_id, text in chunk:
+                    if task_id in self.changed:
+                        continue
+                    tokens = self.tokens_of[task_id] = tokenize(text)
+                    for token in tokens:
+                        if token not in self.postings:
+                            self.postings[token] = set()
+                            new_tokens.append(token)
+                        self.postings[token].add(task_id)
+                # Two sorted runs, which sorted() merges in linear time
+                self.vocabulary = sorted(self.vocabulary + sorted(new_tokens))
+                count += len(chunk)
+                yield count
+        finally:
+            self.changed = None
+
+    def add(self, task_id, text):
+        if self.changed is not None:
+            self.changed.add(task_id)
+        tokens = self.tokens_of[task_id] = tokenize(text)
+        for token in tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            self.postings[token].add(task_id)
+
+    def update(self, task_id, text):
+        if self.tokens_of.get(task_id) != tokenize(text):
+            self.remove(task_id)
+            self.add(task_id, text)
+
+    def remove(self, task_id):
+        if self.changed is not None:
+            self.changed.add(task_id)
+        for token in self.tokens_of.pop(task_id, ()):
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\U0010ffff", start)
+        return self.vocabulary[start:end]
+
+    def search(self, query):
+        # Resolve the most selective term first; once only a few candidates are left, checking
+        # their own tokens beats building the union for a broad prefix like "a" or "1"
+        terms = []
+        for term in tokenize(query):
+            tokens = self.prefix_tokens(term)
+            terms.append((sum(len(self.postings[token]) for token in tokens), term, tokens))
+        terms.sort()
+
+        result = None
+        for size, term, tokens in terms:
+            if result is None:
+                result = set().union(*(self.postings[token] for token in tokens))
+            elif len(result) * 16 < size:
+                result = {task_id for task_id in result if any(token.startswith(term) for token in self.tokens_of[task_id])}
+            else:
+                result &= set().union(*(self.postings[token] for token in tokens))
+            if not result:
+                break
+        return result if result is not None else set()
+
+# --- Due buckets of open tasks, classified against one cached day and rolled over at midnight ---
+class DueTracker:
+    def __init__(self, items=(), today=None):
+        self.today = (today or date.today()).toordinal()
+        self.due_of = {}  # id -> due ordinal, open tasks with a due date only
+        self.bucket_of = {}
+        self.counts = {'overdue': 0, 'today': 0, 'upcoming': 0}
+        for task_id, due in items:
+            self.set(task_id, due)
+
+    def bucket(self, due):
+        if due < self.today:
+            return 'overdue'
+        return 'today' if due == self.today else 'upcoming'
+
+    def set(self, task_id, due):
+        self.discard(task_id)
+        if due is not None:
+            bucket = self.bucket(due)
+            self.due_of[task_id] = due
+            self.bucket_of[task_id] = bucket
+            self.counts[bucket] += 1
+
+    def update(self, task):
+        self.set(task.id, None if task.completed else task.due)
+
+    def discard(self, task_id):
+        bucket = self.bucket_of.pop(task_id, None)
+        if bucket is not None:
+            del self.due_of[task_id]
+            self.counts[bucket] -= 1
+
+    def days_left(self, task):
+        return None if task.due is None else task.due - self.today
+
+    def rollover(self, today=None):
+        # Reclassify for a new day; returns False if the day has not changed. Moving forward,
+        # overdue tasks stay overdue, so only the rest are looked at (unless the clock went back).
+        today = (today or date.today()).toordinal()
+        if today == self.today:
+            return False
+        went_back, self.today = today < self.today, today
+        for task_id, bucket in self.bucket_of.items():
+            if bucket != 'overdue' or went_back:
+                new_bucket = self.bucket(self.due_of[task_id])
+                if new_bucket != bucket:
+                    self.bucket_of[task_id] = new_bucket
+                    self.counts[bucket] -= 1
+                    self.counts[new_bucket] += 1
+        return True
+
+# --- Min-heap of upcoming reminders keyed by fire time; stale entries are skipped when popped ---
+class ReminderQueue:
+    def __init__(self, items=(), notified=None):
+        self.heap = []
+        self.entry_of = {}  # id -> its live heap entry; any other entry for the id is stale
+        self.notified = notified if notified is not None else {}  # id -> (due, kind) of the last reminder fired
+        self.counter = itertools.count()  # tie-breaker so entries never compare past the fire time
+        now = datetime.now()
+        for task_id, due in items:
+            entry = self.next_entry(task_id, due, now)
+            if entry is not None:
+                self.heap.append(entry)
+                self.entry_of[task_id] = entry
+        heapq.heapify(self.heap)
+
+    def fire_times(self, due):
+        due_at = datetime.fromordinal(due) + timedelta(hours=REMINDER_HOUR)
+        return due_at, due_at + timedelta(days=1)
+
+    def next_entry(self, task_id, due, now):
+        due_at, overdue_at = self.fire_times(due)
+        fired = self.notified.get(task_id)
+        if fired == (due, 'overdue'):
+            return None
+        if now < due_at:
+            fire_at, kind = due_at, 'due'
+        elif now < overdue_at and fired != (due, 'due'):
+            fire_at, kind = now, 'due'
+        else:
+            fire_at, kind = max(now, overdue_at), 'overdue'
+        return [fire_at.timestamp(), next(self.counter), task_id, kind, due]
+
+    def set(self, task_id, due, now=None):
+        self.discard(task_id)
+        if due is not None:
+            entry = self.next_entry(task_id, due, now or datetime.now())
+            if entry is not None:
+                heapq.heappush(self.heap, entry)
+                self.entry_of[task_id] = entry
+
+    def update(self, task):
+        self.set(task.id, None if task.completed else task.due)
+
+    def discard(self, task_id):
+        entry = self.entry_of.pop(task_id, None)
+        if entry is not None:
+            entry[2] = None
+            if len(self.heap) > 2 * len(self.entry_of) + 64:
+                self.heap = [entry for entry in self.heap if entry[2] is not None]
+                heapq.heapify(self.heap)
+
+    def next_fire(self):
+        # Timestamp of the nearest live reminder, or None
+        while self.heap and self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now=None):
+        # Pop every reminder that is due by now; returns [(task id, 'due' or 'overdue')]
+        now = now or datetime.now()
+        fired = []
+        while self.heap and self.heap[0][0] <= now.timestamp():
+            _, _, task_id, kind, due = heapq.heappop(self.heap)
+            if task_id is None:
+                continue
+            del self.entry_of[task_id]
+            if kind == 'due' and now >= self.fire_times(due)[1]:
+                kind = 'overdue'  # fired late (e.g. the machine was asleep); skip straight to overdue
+            self.notified[task_id] = (due, kind)
+            fired.append((task_id, kind))
+            if kind == 'due':
+                self.set(task_id, due, now)
+        return fired
+
+# --- Background save worker: coalesces bursts of changes into one write per debounce window ---
+class SaveWorker(threading.Thread):
+    def __init__(self, storage):
+        super().__init__(daemon=True)
+        self.storage = storage
+        self.requests = queue.Queue()
+        self.events = queue.Queue()  # drained on the Tk thread by TodoApp.poll_save_worker
+        self.failed = {}  # id -> task (None for a delete) from the last write that failed
+        self.failing = False
+        self.closed = False
+        self.start()
+
+    def submit(self, changed=(), deleted=()):
+        # Copy on the Tk thread; the tasks keep changing after this returns
+        self.requests.put(([task.copy() for task in changed], list(deleted)))
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            pending = dict(self.failed)
+            try:
+                request = self.requests.get(timeout=SAVE_RETRY_SECONDS if pending else None)
+                taken = 1
+            except queue.Empty:
+                request, taken = ([], []), 0
+            stopping = request is None
+
+            deadline = time.monotonic() + SAVE_DEBOUNCE_SECONDS
+            while request is not None:
+                changed, deleted = request
+                pending.update((task.id, task) for task in changed)
+                pending.update((task_id, None) for task_id in deleted)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                taken += 1
+                stopping = request is None
+
+            if pending:
+                self.write(pending)
+            for _ in range(taken):
+                self.requests.task_done()
+
+    def idle(self):
+        # True once every submitted change has been written
+        return self.requests.unfinished_tasks == 0 and not self.failed
+
+    def write(self, pending):
+        try:
+            self.storage.append(
+                changed=[task for task in pending.values() if task is not None],
+                deleted=[task_id for task_id, task in pending.items() if task is None]
+            )
+            self.failed, self.failing = {}, False
+            if self.storage.needs_compaction():
+                self.events.put(('compact', None))
+        except Exception as e:
+            # Keep the batch; newer changes to the same tasks replace it before the retry
+            self.failed = pending
+            if not self.failing:
+                self.failing = True
+                self.events.put(('error', e))
+        # Reported on its own so an old compaction failure never stops new records from being written
+        error = self.storage.take_compaction_error()
+        if error is not None:
+            self.events.put(('error', error))
+
+    def close(self):
+        # Flush whatever is still queued and wait for the last write to land
+        if not self.closed:
+            self.closed = True
+            self.requests.put(None)
+            self.join()